@@ -1,66 +1,332 @@
 
 import streamlit as st
 import pandas as pd
+import numpy as np
+import hashlib
+import io
+import re
 from datetime import date, timedelta
 from pathlib import Path
 
+from carelog import columnar
+from carelog.snapshot import FOOD_SOURCES, SNAPSHOT_FILE, load_bundled_foods
+from carelog import (CSV_CHUNK_ROWS, EXERCISE_CSV_DTYPES, LOG_SCHEMAS, MEAL_CSV_DTYPES, MEAL_TYPES, SERVING_COLUMNS, WEIGHT_CSV_DTYPES, ActivityCatalog,
+                     DailyRollup, FoodsDB, JobPool, LogBuffer, OpJournal, RerunProfiler, SqliteLogStore, WeightTimeline, apply_meal_edits,
+                     compute_trends, copy_range, daily_starts, downsample, enrich_exercise_upload, enrich_meal_upload, expand_template,
+                     import_chunks, load_activities, kcal_from_food, load_foods, meal_row, template_from_items, template_from_rows)
+
 st.set_page_config(page_title="나만의 체중·식단·걷기 관리", page_icon="🍚", layout="wide")
 
-@st.cache_data
-def load_foods(path: str):
-    df = pd.read_csv(path)
-    needed = {"food","serving","kcal","carbs_g","protein_g","fat_g"}
-    if not needed.issubset(df.columns):
-        raise ValueError("foods CSV must have columns: " + ", ".join(needed))
-    return df
-
-def kcal_from_food(df_foods, name, servings=1.0):
-    row = df_foods[df_foods['food'] == name]
-    if row.empty:
-        return 0.0
-    return float(row.iloc[0]['kcal']) * float(servings)
-
-def kcal_from_walk(activity: str, minutes: float, weight_kg: float):
-    met_map = {"걷기(느림)": 2.8, "걷기(보통)": 3.5, "걷기(빠름)": 4.5}
-    MET = met_map.get(activity, 3.5)
-    return MET * 3.5 * weight_kg / 200.0 * minutes
+@st.cache_resource(show_spinner=False)
+def job_pool():
+    # 세션 전체가 함께 쓰는 백그라운드 작업 풀. 같은 입력(파일 해시 등)의 작업은 하나만 돌고 결과도 공유한다.
+    return JobPool(max_workers=2, keep=16)
+
+@st.cache_resource(max_entries=8, show_spinner=False)
+def foods_db(digest: str, _data: bytes, fmt: str = "csv"):
+    # 파일 내용의 SHA-256(digest)별로 한 번만 파싱. 업로드된 변형 DB는 최근 사용 순으로 8개까지 유지
+    # fmt: "csv" 또는 "parquet"/"arrow"
+    frame = load_foods(io.BytesIO(_data)) if fmt == "csv" else columnar.read_foods(io.BytesIO(_data), fmt)
+    return FoodsDB(digest, frame)
+
+def read_foods_job(job, digest, data, fmt):
+    # 백그라운드 작업: 교체 업로드한 음식 DB를 파싱해 foods_db 레지스트리에 넣는다 (결과는 레지스트리에서 꺼내 쓴다)
+    job.report(0.1, "파일 읽고 검색 색인 만드는 중")
+    foods_db(digest, data, fmt)
+
+@st.cache_resource(max_entries=2, show_spinner=False)
+def bundled_foods_db(sources: tuple, stamp: tuple):
+    # 기본 음식 DB: 원본 CSV들을 합친 스냅샷을 읽고, 스냅샷이 없거나 오래됐으면 CSV를 직접 합친다.
+    # stamp(파일별 수정 시각)가 바뀔 때만 다시 확인한다. 반환: (FoodsDB, 스냅샷 사용 여부)
+    frame, digest, from_snapshot = load_bundled_foods(list(sources), SNAPSHOT_FILE)
+    return FoodsDB(digest, frame), from_snapshot
+
+def warn_unmatched(unmatched):
+    if unmatched:
+        st.warning(f"음식 DB에 없는 음식 {len(unmatched)}종은 0 kcal로 계산되었습니다: " + ", ".join(unmatched[:20]) + (" …" if len(unmatched) > 20 else ""))
+
+@st.cache_resource(max_entries=4, show_spinner=False)
+def activity_catalog(digest: str, _data: bytes):
+    # 음식 DB와 같은 방식: 파일 내용 해시별로 한 번만 읽어 세션끼리 공유
+    return ActivityCatalog(load_activities(io.BytesIO(_data)))
+
+def activity_catalog_from_bytes(data: bytes):
+    return activity_catalog(hashlib.sha256(data).hexdigest(), data)
+
+def upload_digest(upload):
+    # 업로드 파일 내용의 SHA-256 (같은 파일을 두 번 가져오지 않기 위한 키)
+    # 재실행·진행률 갱신마다 다시 해시하지 않도록 업로더의 file_id(새로 올릴 때마다 바뀜)별로 기억한다
+    digests = st.session_state.setdefault("upload_digests", {})
+    digest = digests.get(upload.file_id)
+    if digest is None:
+        upload.seek(0)
+        digest = digests[upload.file_id] = hashlib.file_digest(upload, "sha256").hexdigest()
+        upload.seek(0)
+        if len(digests) > 32:  # 오래된 파일부터 잊는다
+            digests.pop(next(iter(digests)))
+    return digest
+
+@st.fragment(run_every=0.5)
+def job_progress(job, on_cancel):
+    # 진행 중인 백그라운드 작업 표시: 이 부분만 0.5초마다 다시 그리고, 끝나면 앱 전체를 다시 실행해 결과를 반영한다
+    if job.done:
+        st.rerun()
+    st.progress(job.progress, text=f"{job.label} 중… {job.message}")
+    if st.button("취소", key=f"cancel_{job.id}"):
+        job_pool().cancel(job)
+        on_cancel()
+        st.rerun()
+
+def load_upload(job, data, name, kind, staging, dtypes, enrich):
+    # 백그라운드 작업: 업로드 파일 → 빈 로그(staging)에 청크별로 계산해 모음 → (건수, 보고서, 결과 프레임)
+    # CSV는 청크 단위로, Parquet/Arrow는 스키마 타입 그대로 한 번에 읽는다
+    source = io.BytesIO(data)
+    fmt = columnar.file_format(name)
+    chunks = [columnar.read_log(source, f"{kind}_log", fmt)] if fmt else pd.read_csv(source, dtype=dtypes, chunksize=CSV_CHUNK_ROWS)
+    total, report = import_chunks(chunks, staging, enrich,
+                                  on_chunk=lambda total: job.report(source.tell() / max(1, len(data)), f"{total:,}건"))
+    return total, report, staging.frame
+
+def ingest_upload(upload, kind, log, dtypes, enrich, depends=""):
+    # 업로드 파일(CSV/Parquet/Arrow)을 백그라운드 작업으로 읽어 계산하고, 끝나면 로그에 한 번에 추가한다 (화면은 멈추지 않음).
+    # depends: 계산 결과에 영향을 주는 다른 입력(음식 DB 버전 등). 파일·입력이 같으면 다른 세션의 작업에도 붙는다.
+    # 반환: 이번 실행에서 추가를 마쳤으면 (건수, 보고서), 아니면 None (가져옴/진행 중/취소/실패 안내는 여기서 표시)
+    key = (kind, upload_digest(upload))
+    done_keys = st.session_state.setdefault("ingested_uploads", set())
+    undone = st.session_state.setdefault("undone_uploads", set())
+    cancelled = st.session_state.setdefault("cancelled_uploads", set())
+    failed = st.session_state.setdefault("failed_uploads", {})
+    pending = st.session_state.setdefault("upload_jobs", {})
+    if key in done_keys:
+        # 되돌린 업로드도 가져온 파일로 남겨 둔다 (업로더에 파일이 그대로 있어도 자동으로 다시 가져오지 않음)
+        if key in undone:
+            st.caption("가져오기를 되돌린 파일입니다. '다시 실행'으로 되살리거나 새로 가져올 수 있습니다.")
+            st.button("다시 가져오기", key=f"reimport_{kind}", on_click=lambda: (done_keys.discard(key), undone.discard(key)))
+        else:
+            st.caption("이미 가져온 파일입니다.")
+        return None
+    if key in cancelled:
+        st.caption("파일 가져오기를 취소했습니다.")
+        st.button("다시 가져오기", key=f"retry_{kind}", on_click=cancelled.discard, args=(key,))
+        return None
+    def show_failed():
+        # 실패한 작업은 풀에서 놓아 두므로 자동으로 다시 제출하지 않고, 버튼으로만 다시 시도한다
+        st.error(f"파일을 읽을 수 없습니다: {failed[key]}")
+        st.button("다시 가져오기", key=f"retry_failed_{kind}", on_click=failed.pop, args=(key, None))
+    if key in failed:
+        show_failed()
+        return None
+    job = pending.get(key)
+    if job is None:
+        job = pending[key] = job_pool().submit((*key, depends), f"파일 가져오기 ({upload.name})", load_upload,
+                                               upload.getvalue(), upload.name, kind, log.blank(), dtypes, enrich)
+    if not job.done:
+        job_progress(job, lambda: (pending.pop(key, None), cancelled.add(key)))
+        return None
+    del pending[key]
+    if job.status == "cancelled":
+        cancelled.add(key)
+        st.caption("파일 가져오기가 취소되었습니다.")
+        return None
+    if job.status == "failed":
+        failed[key] = job.error
+        job_pool().release(job)
+        show_failed()
+        return None
+    total, report, frame = job.result
+    # 결과는 한 번에 추가한다 (되돌리기·저장 파일에도 업로드 한 번으로 반영)
+    with prof.section(f"업로드: {upload.name}"), st.session_state.journal.group(f"파일 업로드 ({upload.name})", upload=key):
+        log.extend(frame)
+    job_pool().release(job)
+    done_keys.add(key)
+    return total, report
+
+@st.cache_resource
+def open_log_store(path: str):
+    # 사용자별 저장 파일 하나를 그 사용자의 세션(브라우저 탭)끼리 공유한다
+    return SqliteLogStore(path)
+
+def user_store_path(user: str):
+    # 사용자 이름 → 저장 파일 경로 (이름에는 글자·숫자·-·_만 허용, 아니면 None)
+    user = user.strip()
+    return f"care_logs_{user}.sqlite" if re.fullmatch(r"[\w-]+", user) else None
+
+PROFILE_LOG = "care_profile.jsonl"
+
+def time_series_chart(data, budget):
+    st.line_chart(downsample(data, budget))
+
+WEEKDAYS = ["월", "화", "수", "목", "금", "토", "일"]
+
+def period_bounds(period):
+    # 기간 date_input 값 → (시작일, 종료일). 날짜를 하나만 고른 중간 상태면 그 하루
+    return (period + period)[:2] if isinstance(period, tuple) else (period, period)
+
+def session_memo(name, key, fn):
+    # 세션별 1칸 캐시: key(로그 버전 등)가 같으면 이전 계산 결과를 그대로 쓴다.
+    cached = st.session_state.get(name)
+    if cached is not None and cached[0] == key:
+        return cached[1]
+    value = fn()
+    st.session_state[name] = (key, value)
+    return value
+
+def session_sizes():
+    # 실행 끝에 기록할 세션 상태 크기: 로그별 행 수·배열 크기(KB), 되돌리기 기록 수
+    sizes = {key: {"rows": len(st.session_state[key]), "kb": round(st.session_state[key].nbytes / 1024, 1)}
+             for key in OpJournal.LABELS if key in st.session_state}
+    if "journal" in st.session_state:
+        sizes["journal_entries"] = len(st.session_state.journal.entries)
+    return sizes
+
+# 성능 측정(선택): 주소에 ?debug=1을 붙이거나 사이드바 맨 아래 토글로 켠다. 꺼져 있으면 측정하지 않는다.
+if "profiler" not in st.session_state:
+    st.session_state.profiler = RerunProfiler()
+prof = st.session_state.profiler
+prof.enabled = st.session_state.get("profile_on", st.query_params.get("debug") == "1")
+# 기록 파일은 앱 폴더의 고정 파일 하나 (?debug=1로 누구나 열 수 있으므로 경로를 입력받지 않는다)
+prof.log_path = PROFILE_LOG if st.session_state.get("profile_log") else None
+prof.begin("전체", sample=session_sizes)
 
 # Sidebar
 st.sidebar.header("설정")
-foods_file = st.sidebar.file_uploader("음식 DB(foods_korean.csv) 교체 업로드", type=["csv"], accept_multiple_files=False)
-default_foods = "foods_korean.csv"
-if foods_file is not None:
-    foods_df = pd.read_csv(foods_file)
-else:
-    if Path(default_foods).exists():
-        foods_df = load_foods(default_foods)
+foods_file = st.sidebar.file_uploader("음식 DB(foods_korean.csv) 교체 업로드", type=["csv", "parquet", "arrow"], accept_multiple_files=False)
+with prof.section("음식 DB 읽기"):
+    db = None
+    if foods_file is None:
+        st.session_state.pop("foods_job", None)
     else:
-        st.sidebar.error("foods_korean.csv 파일이 앱과 같은 폴더에 있어야 합니다.")
-        st.stop()
+        # 교체 DB는 백그라운드에서 읽어 레지스트리에 넣고, 끝날 때까지는 기본 음식 DB로 계속 쓴다
+        digest = upload_digest(foods_file)
+        foods_fmt = columnar.file_format(foods_file.name) or "csv"
+        foods_job = st.session_state.get("foods_job")
+        if foods_job is None or foods_job.key != ("foods", digest):
+            foods_job = st.session_state.foods_job = job_pool().submit(
+                ("foods", digest), "음식 DB 읽기", read_foods_job, digest, foods_file.getvalue(), foods_fmt)
+        if foods_job.status == "failed":
+            st.sidebar.error(f"음식 DB를 읽을 수 없습니다: {foods_job.error}")
+            st.stop()
+        elif foods_job.status == "done":
+            # 작업이 채운 레지스트리 항목 (그사이 밀려났으면 여기서 다시 읽음). 작업 기록은 처음 한 번 놓아준다
+            if st.session_state.get("foods_job_released") != foods_job.id:
+                job_pool().release(foods_job)
+                st.session_state.foods_job_released = foods_job.id
+            db = foods_db(digest, foods_file.getvalue(), foods_fmt)
+        elif foods_job.status == "cancelled" or foods_job.cancelling:
+            st.sidebar.caption("음식 DB 교체를 취소해 기본 음식 DB를 사용합니다. 파일을 지우고 다시 올리면 다시 읽습니다.")
+        else:
+            with st.sidebar:
+                job_progress(foods_job, lambda: None)
+    if db is None:
+        default_foods = [p for p in FOOD_SOURCES if Path(p).exists()]
+        if not default_foods:
+            st.sidebar.error("foods_korean.csv 파일이 앱과 같은 폴더에 있어야 합니다.")
+            st.stop()
+        stamp = tuple((p, Path(p).stat().st_mtime_ns) for p in default_foods + [SNAPSHOT_FILE] if Path(p).exists())
+        db, from_snapshot = bundled_foods_db(tuple(default_foods), stamp)
+        if not from_snapshot:
+            st.sidebar.caption("음식 DB 스냅샷이 없거나 원본 CSV와 달라 CSV에서 읽었습니다. `python -m carelog.snapshot`으로 다시 만들 수 있습니다.")
 
+foods_df = db.frame
+food_index = db.index
 st.sidebar.write(f"등록된 음식 개수: **{len(foods_df)}**")
+chart_budget = st.sidebar.number_input("차트 최대 표시 점 수", min_value=100, max_value=5000, value=500, step=100, help="기록이 많으면 추세 모양을 유지하면서 이 개수만큼만 그립니다.")
+
+activities_path = Path("activities_korean.csv")
+if not activities_path.exists():
+    st.sidebar.error("activities_korean.csv 파일이 앱과 같은 폴더에 있어야 합니다.")
+    st.stop()
+catalog = activity_catalog_from_bytes(activities_path.read_bytes())
 
 # Session states
 if "weight_log" not in st.session_state:
-    st.session_state.weight_log = pd.DataFrame(columns=["date","weight_kg","note"])
+    st.session_state.weight_log = LogBuffer(LOG_SCHEMAS["weight_log"])
+if "weight_timeline" not in st.session_state:
+    st.session_state.weight_timeline = WeightTimeline(st.session_state.weight_log)
+weights = st.session_state.weight_timeline
 if "meal_log" not in st.session_state:
-    st.session_state.meal_log = pd.DataFrame(columns=["date","meal","food","servings","kcal"])
+    st.session_state.meal_log = LogBuffer(LOG_SCHEMAS["meal_log"], categories={"meal": MEAL_TYPES, "food": food_index.names})
 if "exercise_log" not in st.session_state:
-    st.session_state.exercise_log = pd.DataFrame(columns=["date","activity","minutes","weight_kg","kcal_burned"])
+    st.session_state.exercise_log = LogBuffer(LOG_SCHEMAS["exercise_log"], categories={"activity": catalog.names})
+# 음식 DB가 바뀌면(교체 업로드) 새 음식명을 범주에 추가
+st.session_state.meal_log.pin_categories("food", food_index.names)
+st.session_state.exercise_log.pin_categories("activity", catalog.names)
+if "daily_rollup" not in st.session_state:
+    rollup = DailyRollup()
+    for kind in ["meal", "exercise"]:
+        rollup.update(kind, None, st.session_state[f"{kind}_log"].frame)
+        st.session_state[f"{kind}_log"].subscribe(rollup.listener(kind))
+    st.session_state.daily_rollup = rollup
+if "journal" not in st.session_state:
+    st.session_state.journal = OpJournal({key: st.session_state[key] for key in ["meal_log", "exercise_log", "weight_log"]})
+journal = st.session_state.journal
+
+# 로컬 저장(SQLite) 선택
+# 저장 파일은 사용자 이름별로 따로 둔다 (다른 사용자의 기록을 읽거나 지우지 않게)
+use_store = st.sidebar.checkbox("기록을 로컬 파일(SQLite)에 저장", value=False)
+store_user = st.sidebar.text_input("사용자 이름", key="store_user", help="같은 이름으로 열면 같은 저장 파일(care_logs_이름.sqlite)을 씁니다.")
+store_path = user_store_path(store_user) if use_store else None
+if use_store and store_path is None:
+    st.sidebar.caption("저장하려면 사용자 이름(글자·숫자·-·_)을 입력하세요.")
+if store_path is not None:
+    log_store = open_log_store(store_path)
+    if any(st.session_state[key].store is not log_store for key in journal.logs):
+        with prof.section("저장소 연결"):
+            for key in journal.logs:
+                if st.session_state[key].store is not log_store:
+                    st.session_state[key].attach(log_store, key)
+            # 저장소에서 다시 읽은 상태를 되돌리기 시작점으로
+            journal.reset()
+else:
+    for key in ["meal_log", "exercise_log", "weight_log"]:
+        st.session_state[key].detach()
+
+# 기록 내보내기: 파일 내용은 버튼을 누를 때 현재 로그로 만든다 (탭에서 바뀐 기록도 반영)
+with st.sidebar.expander("기록 내보내기 (Parquet / Arrow)"):
+    export_fmt = st.radio("형식", ["parquet", "arrow"], horizontal=True, key="export_fmt")
+    for key, label in OpJournal.LABELS.items():
+        st.download_button(f"{label} 기록 다운로드", data=lambda key=key: columnar.log_to_bytes(st.session_state[key].frame, key, export_fmt),
+                           file_name=f"{key}.{export_fmt}", on_click="ignore", key=f"export_{key}", use_container_width=True)
+
+# 되돌리기 / 다시 실행 (CSV 업로드를 되돌리면 그 파일 옆에 '다시 가져오기' 버튼이 생긴다)
+# 탭 안의 기록은 탭만 다시 그리므로 버튼은 항상 켜 두고, 할 일이 없으면 안내만 한다.
+undo_col, redo_col = st.sidebar.columns(2)
+if undo_col.button("↩ 되돌리기", use_container_width=True):
+    with prof.section("되돌리기"):
+        entry = journal.undo()
+    if entry is None:
+        st.sidebar.caption("되돌릴 작업이 없습니다.")
+    else:
+        if "upload" in entry:
+            st.session_state.setdefault("undone_uploads", set()).add(entry["upload"])
+        st.sidebar.caption(f"되돌림: {entry['label']}")
+if redo_col.button("↪ 다시 실행", use_container_width=True):
+    with prof.section("다시 실행"):
+        entry = journal.redo()
+    if entry is None:
+        st.sidebar.caption("다시 실행할 작업이 없습니다.")
+    else:
+        if "upload" in entry:
+            # 다시 가져오기를 누른 뒤라면 진행 중인 가져오기는 멈춘다 (같은 파일이 두 번 들어가지 않게)
+            st.session_state.setdefault("undone_uploads", set()).discard(entry["upload"])
+            st.session_state.setdefault("ingested_uploads", set()).add(entry["upload"])
+            job = st.session_state.get("upload_jobs", {}).pop(entry["upload"], None)
+            if job is not None:
+                job_pool().cancel(job)
+        st.sidebar.caption(f"다시 실행: {entry['label']}")
 
 st.title("🍚 나만의 체중·식단·걷기 관리 대시보드")
 st.caption("갱년기·당뇨 전단계 맞춤 관리 (의료 조언이 아닌 생활 가이드입니다. 개인 상황은 전문가와 상의하세요.)")
 
-tabs = st.tabs(["대시보드", "식단 기록", "운동(걷기) 기록", "운동 가이드", "체중 기록", "음식 DB"])
-
 # Dashboard
-with tabs[0]:
+@st.fragment
+@prof.timed("탭: 대시보드")
+def dashboard_tab():
     st.subheader("오늘 요약")
     today = date.today().isoformat()
-    today_meals = st.session_state.meal_log[st.session_state.meal_log["date"] == today]
-    today_kcal_in = today_meals["kcal"].sum() if not today_meals.empty else 0
-    today_ex = st.session_state.exercise_log[st.session_state.exercise_log["date"] == today]
-    today_kcal_out = today_ex["kcal_burned"].sum() if not today_ex.empty else 0
+    today_sum = st.session_state.daily_rollup.day(today)
+    today_kcal_in = today_sum["kcal_in"]
+    today_kcal_out = today_sum["kcal_out"]
     col1, col2, col3, col4 = st.columns(4)
     with col1:
         st.metric("오늘 섭취 열량(kcal)", f"{today_kcal_in:.0f}")
@@ -69,183 +335,301 @@ with tabs[0]:
     with col3:
         st.metric("에너지 밸런스", f"{today_kcal_in - today_kcal_out:.0f} kcal")
     with col4:
-        if not st.session_state.weight_log.empty:
-            latest_w = st.session_state.weight_log.sort_values("date").iloc[-1]["weight_kg"]
-            st.metric("현재 체중(kg)", f"{latest_w}")
+        if weights.latest is not None:
+            st.metric("현재 체중(kg)", f"{weights.latest_kg():.1f}")
         else:
             st.metric("현재 체중(kg)", "—")
 
     st.divider()
     st.subheader("최근 체중 추세")
-    if not st.session_state.weight_log.empty:
-        w = st.session_state.weight_log.sort_values("date").copy()
-        w["date"] = pd.to_datetime(w["date"])
-        st.line_chart(w.set_index("date")["weight_kg"])
+    if not weights.frame().empty:
+        w = weights.frame()
+        time_series_chart(w.set_index("date")["weight_kg"], chart_budget)
     else:
         st.info("체중을 한 번 이상 기록하면 선그래프가 표시됩니다.")
 
+    st.divider()
+    st.subheader("주간·월간 추세")
+    period = st.radio("기간 단위", ["주간", "월간"], horizontal=True, key="trend_period")
+    freq = {"주간": "W", "월간": "MS"}[period]
+    rollup = st.session_state.daily_rollup
+    if rollup.frame().empty and st.session_state.weight_log.empty:
+        st.info("식단·운동·체중을 기록하면 기간별 추세가 표시됩니다.")
+    else:
+        trends = session_memo(
+            "_trend_cache",
+            (rollup.version, st.session_state.weight_log.version, freq),
+            lambda: compute_trends(rollup.frame(), st.session_state.weight_log.frame, freq),
+        )
+        t1, t2 = st.columns(2)
+        with t1:
+            st.markdown(f"**{period} 일평균 섭취 vs 소모 열량(kcal)**")
+            if not trends["energy"].empty:
+                time_series_chart(trends["energy"][["섭취", "소모"]], chart_budget)
+            st.markdown(f"**{period} 탄·단·지 열량 비율(%)**")
+            if not trends["macros"].empty:
+                st.bar_chart(trends["macros"])
+        with t2:
+            st.markdown("**체중 (일별 · 7일 이동평균 · 지수평활)**")
+            if not trends["weight"].empty:
+                time_series_chart(trends["weight"], chart_budget)
+                st.dataframe(trends["weight_period"].round(1))
+
+def save_meal_edits(log, view, editor_key):
+    # 저장 버튼 콜백: 탭 본문보다 먼저 실행되므로, 이어서 그려지는 편집기가 저장된 새 로그 버전을 보여 준다
+    # (본문에서 저장하면 이미 그려진 예전 편집기가 남아 다음 편집이 새 편집기로 넘어가지 않는다)
+    with prof.section("식단 표 저장"), journal.group("식단 표 편집"):
+        st.session_state.meal_save_result = apply_meal_edits(log, view, st.session_state.get(editor_key, {}), food_index)
+
+def save_template(log):
+    # 템플릿 저장 버튼 콜백: 탭 본문보다 먼저 실행되어, 이어서 그려지는 선택 상자에 새 템플릿이 바로 보인다
+    # (기간·이름은 버튼을 누른 시점의 입력값)
+    start, end = period_bounds(st.session_state.template_source)
+    name = st.session_state.template_new_name.strip()
+    rows = log.take(log.ids_between(start, end))
+    if not name:
+        st.session_state.template_saved = (False, "템플릿 이름을 입력하세요.")
+    elif rows.empty:
+        st.session_state.template_saved = (False, f"{start} ~ {end}에 저장된 식단이 없어요.")
+    else:
+        st.session_state.meal_templates[name] = template_from_rows(rows, start)
+        st.session_state.template_name = name
+        st.session_state.template_saved = (True, f"'{name}' 템플릿이 저장되었습니다 ({len(rows)}개 항목).")
+
+def delete_template(name):
+    # 템플릿 삭제 버튼 콜백 (선택 상자는 첫 템플릿으로)
+    st.session_state.meal_templates.pop(name, None)
+    st.session_state.pop("template_name", None)
+
 # Meal logging
-with tabs[1]:
+@st.fragment
+@prof.timed("탭: 식단 기록")
+def meal_tab():
     st.subheader("식단 기록 추가")
     log_col1, log_col2 = st.columns([2,1])
     with log_col1:
         sel_date = st.date_input("날짜", value=date.today())
-        meal_type = st.selectbox("끼니", ["아침","점심","저녁","간식"])
-        # 기본 아침 식단 프리셋 버튼
-        with st.expander("🧺 아침 프리셋 빠르게 추가", expanded=(meal_type=="아침")):
-            colp1, colp2, colp3 = st.columns(3)
-            if "프리셋_서빙" not in st.session_state:
-                st.session_state["프리셋_서빙"] = {
-                    "플레인요거트": 1.0, "토마토": 1.0, "사과": 1.0,
-                    "고구마": 1.0, "통밀빵": 1.0, "달걀": 2.0
-                }
+        meal_type = st.selectbox("끼니", MEAL_TYPES)
+        meal_log = st.session_state.meal_log
+        # 식단 템플릿: 영양성분까지 계산해 둔 행 묶음. 기간의 시작일마다 펼쳐 한 번에 추가한다
+        if "프리셋_서빙" not in st.session_state:
+            st.session_state["프리셋_서빙"] = {
+                "플레인요거트": 1.0, "토마토": 1.0, "사과": 1.0,
+                "고구마": 1.0, "통밀빵": 1.0, "달걀": 2.0
+            }
+        templates = st.session_state.setdefault("meal_templates", {})
+        if "아침 프리셋" not in templates:
+            templates["아침 프리셋"] = template_from_items(food_index, [("아침", item, servings) for item, servings in st.session_state["프리셋_서빙"].items()])
+        with st.expander("🧺 식단 템플릿", expanded=(meal_type=="아침")):
             st.caption("버튼을 누르면 아래 기록 표에 한 번에 추가됩니다.")
             if st.button("아침 프리셋(요거트·토마토·사과·고구마·통밀빵·달걀 2개) 추가"):
-                add_items = ["플레인요거트","토마토","사과","고구마","통밀빵","달걀"]
-                for item in add_items:
-                    servings = st.session_state["프리셋_서빙"].get(item, 1.0)
-                    kcal = kcal_from_food(foods_df, item, servings)
-                    new_row = {"date": sel_date.isoformat(),"meal": "아침","food": item,"servings": servings,"kcal": kcal}
-                    st.session_state.meal_log = pd.concat([st.session_state.meal_log, pd.DataFrame([new_row])], ignore_index=True)
+                with journal.group("아침 프리셋 추가"):
+                    meal_log.extend(expand_template(templates["아침 프리셋"], [sel_date]))
                 st.success("아침 프리셋이 추가되었습니다!")
+            t_name = st.selectbox("템플릿", list(templates), key="template_name")
+            template = templates[t_name]
+            span = int(template["day"].max()) + 1 if len(template) else 1
+            st.caption(f"{span}일치 {len(template)}개 항목 · 하루 평균 {template['kcal'].sum() / span:.0f} kcal")
+            t_start, t_end = period_bounds(st.date_input("적용 기간", value=(sel_date, sel_date), key="template_period"))
+            if span == 1:
+                t_weekdays = st.multiselect("요일", WEEKDAYS, default=WEEKDAYS, key="template_weekdays")
+                starts = daily_starts(t_start, t_end, [WEEKDAYS.index(d) for d in t_weekdays])
+            else:
+                # 여러 날짜 템플릿은 기간 안에서 템플릿 길이마다 한 벌씩
+                starts = pd.date_range(t_start, t_end, freq=f"{span}D")
+            if st.button(f"템플릿 추가 ({len(starts)}회)", key="template_apply"):
+                with journal.group(f"템플릿 추가 ({t_name})"):
+                    meal_log.extend(expand_template(template, starts))
+                st.success(f"{len(starts) * len(template)}건 추가되었습니다.")
+            st.markdown("**기록된 식단을 템플릿으로 저장**")
+            st.date_input("저장할 기간", value=(sel_date, sel_date), key="template_source")
+            st.text_input("템플릿 이름", key="template_new_name")
+            save_col, del_col = st.columns(2)
+            save_col.button("템플릿 저장", key="template_save", on_click=save_template, args=(meal_log,))
+            saved = st.session_state.pop("template_saved", None)
+            if saved is not None:
+                (st.success if saved[0] else st.warning)(saved[1])
+            if t_name != "아침 프리셋":
+                del_col.button(f"'{t_name}' 삭제", key="template_delete", on_click=delete_template, args=(t_name,))
 
-        # 전날 식단 복사
-        with st.expander("📅 전날 식단 불러오기", expanded=False):
+        # 식단 복사: 날짜 색인으로 원본 기간의 행만 읽어 한 번에 붙여 넣는다
+        with st.expander("📅 식단 복사", expanded=False):
             if st.button("전날과 같음 → 전날 식단을 오늘 날짜로 복사"):
-                # 전날(선택일 - 1일) 식단 찾기
-                prev_date = (sel_date - timedelta(days=1)).isoformat()
-                prev = st.session_state.meal_log[st.session_state.meal_log["date"] == prev_date]
-                if prev.empty:
-                    st.warning(f"{prev_date}에 저장된 식단이 없어요.")
+                prev_date = sel_date - timedelta(days=1)
+                with journal.group("전날 식단 복사"):
+                    n_copied = copy_range(meal_log, prev_date, prev_date, sel_date)
+                if n_copied:
+                    st.success(f"{n_copied}건 복사되었습니다.")
+                else:
+                    st.warning(f"{prev_date.isoformat()}에 저장된 식단이 없어요.")
+            week_start = sel_date - timedelta(days=sel_date.weekday())
+            weeks = st.number_input("반복할 주 수", min_value=1, max_value=12, value=1, step=1, key="repeat_weeks")
+            if st.button(f"이번 주({week_start.isoformat()}~) 식단을 다음 {weeks}주에 반복", key="repeat_week"):
+                with journal.group("이번 주 반복"):
+                    n_copied = copy_range(meal_log, week_start, week_start + timedelta(days=6), week_start + timedelta(days=7), repeat=weeks)
+                if n_copied:
+                    st.success(f"{n_copied}건 복사되었습니다.")
                 else:
-                    copied = prev.copy()
-                    copied["date"] = sel_date.isoformat()
-                    st.session_state.meal_log = pd.concat([st.session_state.meal_log, copied], ignore_index=True)
-                    st.success(f"{len(copied)}건 복사되었습니다.")
+                    st.warning("이번 주에 저장된 식단이 없어요.")
+            st.markdown("**기간 복사**")
+            c_start, c_end = period_bounds(st.date_input("복사할 기간", value=(sel_date - timedelta(days=1), sel_date - timedelta(days=1)), key="copy_source"))
+            c_to = st.date_input("붙여 넣을 시작일", value=sel_date, key="copy_to")
+            c_repeat = st.number_input("반복 횟수 (기간 길이 간격)", min_value=1, max_value=52, value=1, step=1, key="copy_repeat")
+            if st.button("기간 복사", key="copy_range"):
+                with journal.group("식단 기간 복사"):
+                    n_copied = copy_range(meal_log, c_start, c_end, c_to, repeat=c_repeat)
+                if n_copied:
+                    st.success(f"{c_start} ~ {c_end} 식단 {n_copied}건을 {c_to}부터 복사했습니다.")
+                else:
+                    st.warning(f"{c_start} ~ {c_end}에 저장된 식단이 없어요.")
 
         # 단일 항목 추가
-        food = st.selectbox("음식", foods_df["food"].tolist(), index=foods_df["food"].tolist().index("플레인요거트") if "플레인요거트" in foods_df["food"].tolist() else 0)
-        servings = st.number_input("서빙 수(기본=1)", min_value=0.25, max_value=5.0, step=0.25, value=1.0)
-        kcal = kcal_from_food(foods_df, food, servings)
+        query = st.text_input("음식 검색 (초성 가능: ㅎㅁㅂ → 현미밥)", value="", key="food_query")
+        food_options = db.search.search(query, limit=50) if query.strip() else db.search.names
+        if not food_options:
+            st.caption("검색 결과가 없어 전체 목록을 표시합니다.")
+            food_options = db.search.names
+        food = st.selectbox("음식", food_options, index=food_options.index("플레인요거트") if "플레인요거트" in food_options else 0)
+        serving_g = food_index.serving_grams(food)
+        by_grams = st.radio("입력 단위", ["서빙", "그램(g)"], horizontal=True, key="amount_unit") == "그램(g)"
+        if by_grams and np.isnan(serving_g):
+            st.caption("이 음식은 서빙 그램 정보가 없어 서빙 수로 입력합니다.")
+            by_grams = False
+        if by_grams:
+            grams = st.number_input(f"섭취량(g) (1서빙 = {serving_g:.0f}g)", min_value=5.0, max_value=3000.0, step=5.0, value=float(serving_g))
+            servings = grams / serving_g
+        else:
+            servings = st.number_input("서빙 수(기본=1)", min_value=0.25, max_value=5.0, step=0.25, value=1.0)
+        kcal = kcal_from_food(food_index, food, servings)
         st.write(f"계산된 열량: **{kcal:.0f} kcal**")
         if st.button("기록 추가"):
-            new_row = {"date": sel_date.isoformat(),"meal": meal_type,"food": food,"servings": servings,"kcal": kcal}
-            st.session_state.meal_log = pd.concat([st.session_state.meal_log, pd.DataFrame([new_row])], ignore_index=True)
+            new_row = meal_row(food_index, sel_date.isoformat(), meal_type, food, servings)
+            st.session_state.meal_log.append(new_row)
             st.success("기록되었습니다!")
 
     with log_col2:
         st.markdown("**CSV 업로드(선택)**")
-        up = st.file_uploader("sample_meal_log.csv 형식", type=["csv"])
+        up = st.file_uploader("sample_meal_log.csv 형식 (Parquet/Arrow 가능)", type=["csv", "parquet", "arrow"])
         if up is not None:
-            up_df = pd.read_csv(up)
-            if "kcal" not in up_df.columns:
-                rows = []
-                for _, r in up_df.iterrows():
-                    k = kcal_from_food(foods_df, r["food"], r.get("servings", 1))
-                    rows.append(k)
-                up_df["kcal"] = rows
-            st.session_state.meal_log = pd.concat([st.session_state.meal_log, up_df], ignore_index=True)
-            st.success(f"{len(up_df)}건 업로드됨")
+            result = ingest_upload(up, "meal", st.session_state.meal_log, MEAL_CSV_DTYPES,
+                                   lambda c, index=food_index, search=db.search: enrich_meal_upload(c, index, search), depends=db.digest)
+            if result is not None:
+                resolved = result[1].get("resolved", {})
+                if resolved:
+                    st.info("음식명을 DB 기준으로 보정했습니다: " + ", ".join(f"{a} → {b}" for a, b in list(resolved.items())[:20]))
+                warn_unmatched(result[1].get("unmatched", []))
+                no_grams = result[1].get("no_grams", [])
+                if no_grams:
+                    st.warning(f"1서빙 그램을 알 수 없는 음식 {len(no_grams)}종은 그램만 적힌 행의 서빙 수를 비워 두고 0 kcal로 계산했습니다: "
+                               + ", ".join(no_grams[:20]) + (" …" if len(no_grams) > 20 else ""))
+                st.success(f"{result[0]}건 업로드됨")
 
     st.divider()
     st.subheader("기록된 식단 (수정/삭제 가능)")
     if st.session_state.meal_log.empty:
         st.info("아직 기록이 없습니다.")
     else:
-        # 편집 가능한 표 제공 + 삭제 체크박스
-        df = st.session_state.meal_log.copy().reset_index().rename(columns={"index":"ID"})
-        # 삭제 체크박스 컬럼 추가
-        if "삭제" not in df.columns:
-            df["삭제"] = False
-        edited = st.data_editor(
+        # 기간·페이지로 고른 행만 편집기에 올리고, 저장 시 바뀐 행만 반영한다.
+        log = st.session_state.meal_log
+        f1, f2, f3 = st.columns([2,1,1])
+        with f1:
+            period = st.date_input("기간", value=(date.today() - timedelta(days=6), date.today()), key="meal_period")
+        start, end = period_bounds(period)
+        ids = log.ids_between(start, end)
+        with f2:
+            page_size = st.selectbox("페이지당 행 수", [25, 50, 100, 200], index=1, key="meal_page_size")
+        n_pages = max(1, -(-len(ids) // page_size))
+        with f3:
+            page = st.number_input(f"페이지 (총 {n_pages})", min_value=1, max_value=n_pages, value=1, step=1, key="meal_page")
+        page = min(page, n_pages)
+        view = log.take(ids[(page - 1) * page_size:page * page_size])
+        st.caption(f"{start} ~ {end}: {len(ids)}건 중 {len(view)}건 표시")
+        df = view.reset_index().rename(columns={"id": "ID"})
+        df["삭제"] = False
+        # 편집 내용은 보이는 구간·로그 버전별로 따로 보관 (저장 후에는 새 편집기로 초기화)
+        editor_key = f"meal_editor_{start}_{end}_{page_size}_{page}_{log.version}"
+        st.data_editor(
             df,
+            key=editor_key,
             num_rows="dynamic",
             use_container_width=True,
             column_config={
                 "ID": st.column_config.NumberColumn(disabled=True),
                 "date": st.column_config.DateColumn("date"),
-                "meal": st.column_config.SelectboxColumn(options=["아침","점심","저녁","간식"]),
+                "meal": st.column_config.SelectboxColumn(options=MEAL_TYPES),
                 "servings": st.column_config.NumberColumn(step=0.25, min_value=0.0),
-                "kcal": st.column_config.NumberColumn(help="음식/서빙 변경 후 '열량 재계산'을 누르면 자동 계산됩니다."),
+                "kcal": st.column_config.NumberColumn(help="음식/서빙을 바꾸고 '변경사항 저장'을 누르면 자동 계산됩니다."),
                 "삭제": st.column_config.CheckboxColumn()
             },
             hide_index=True
         )
 
-        c1, c2, c3 = st.columns([1,1,2])
+        c1, c2 = st.columns([2,2])
         with c1:
-            if st.button("선택 행 삭제"):
-                to_drop = edited[edited["삭제"]==True]["ID"].tolist()
-                base = st.session_state.meal_log.reset_index()
-                base = base[~base["index"].isin(to_drop)]
-                st.session_state.meal_log = base.drop(columns=["index"]).reset_index(drop=True)
-                st.success(f"{len(to_drop)}건 삭제되었습니다.")
+            st.button("변경사항 저장", on_click=save_meal_edits, args=(log, view, editor_key))
+            saved = st.session_state.pop("meal_save_result", None)
+            if saved is not None:
+                n_upd, n_add, n_del, unmatched = saved
+                warn_unmatched(unmatched)
+                st.success(f"수정 {n_upd}건, 추가 {n_add}건, 삭제 {n_del}건이 저장되었습니다.")
 
         with c2:
-            if st.button("열량 재계산 & 저장"):
-                # edited를 기준으로 kcal 재계산
-                tmp = edited.drop(columns=["ID","삭제"])
-                # date 타입 보정
-                if pd.api.types.is_datetime64_any_dtype(tmp["date"]):
-                    tmp["date"] = tmp["date"].dt.date.astype(str)
-                # kcal 재계산
-                kcals = []
-                for _, r in tmp.iterrows():
-                    kcals.append(kcal_from_food(foods_df, r["food"], r.get("servings", 1)))
-                tmp["kcal"] = kcals
-                st.session_state.meal_log = tmp.reset_index(drop=True)
-                st.success("변경사항이 저장되었습니다.")
-
-        with c3:
             day = st.date_input("일자별 합계 보기", value=date.today(), key="sum_date")
-            ddf = st.session_state.meal_log[st.session_state.meal_log["date"] == day.isoformat()]
-            st.write(f"**{day.isoformat()} 섭취 열량 합계: {ddf['kcal'].sum():.0f} kcal**")
+            day_kcal = st.session_state.daily_rollup.day(day)["kcal_in"]
+            st.write(f"**{day.isoformat()} 섭취 열량 합계: {day_kcal:.0f} kcal**")
 
 # Exercise (Walking) logging
-with tabs[2]:
-    st.subheader("걷기 기록 추가 (칼로리 자동 계산)")
+@st.fragment
+@prof.timed("탭: 운동(걷기) 기록")
+def exercise_tab():
+    st.subheader("운동 기록 추가 (칼로리 자동 계산)")
     e_col1, e_col2 = st.columns([2,1])
     with e_col1:
         e_date = st.date_input("날짜", value=date.today(), key="e_date")
-        activity = st.selectbox("활동", ["걷기(느림)","걷기(보통)","걷기(빠름)"])
+        activity = st.selectbox("활동", catalog.names)
+        info = catalog.info(activity)
+        speed = " · ".join(f"{v:g}" for v in info[["speed_min_kmh", "speed_max_kmh"]].dropna())
+        st.caption(f"MET {info['met']:g}" + (f" · 속도 {speed} km/h" if speed else "") + (f" · {info['note']}" if info["note"] else ""))
+        if not info["acl_safe"]:
+            st.warning("무릎(ACL) 부담이 큰 활동입니다. 운동 가이드 탭을 참고하세요.")
         minutes = st.number_input("시간(분)", min_value=5, max_value=240, value=30, step=5)
-        if not st.session_state.weight_log.empty:
-            latest_w = float(st.session_state.weight_log.sort_values("date").iloc[-1]["weight_kg"])
-        else:
-            latest_w = 60.0
-        weight_kg = st.number_input("체중(kg) (칼로리 계산용)", min_value=30.0, max_value=200.0, value=latest_w, step=0.5)
-        kcal_burned = kcal_from_walk(activity, minutes, weight_kg)
+        # 선택한 날짜 기준 체중 (그 날짜 이전의 마지막 체중 기록)
+        asof_w = float(weights.asof(e_date)[0])
+        weight_kg = st.number_input("체중(kg) (칼로리 계산용)", min_value=30.0, max_value=200.0, value=min(max(asof_w, 30.0), 200.0), step=0.5)
+        kcal_burned = float(catalog.burn(activity, minutes, weight_kg)[0])
         st.write(f"예상 소모 열량: **{kcal_burned:.0f} kcal**")
         if st.button("운동 기록 추가"):
             new_e = {"date": e_date.isoformat(), "activity": activity, "minutes": minutes, "weight_kg": weight_kg, "kcal_burned": kcal_burned}
-            st.session_state.exercise_log = pd.concat([st.session_state.exercise_log, pd.DataFrame([new_e])], ignore_index=True)
+            st.session_state.exercise_log.append(new_e)
             st.success("운동이 기록되었습니다.")
 
     with e_col2:
         st.markdown("**CSV 업로드(선택)**")
-        eup = st.file_uploader("sample_exercise_log.csv 형식", type=["csv"])
+        eup = st.file_uploader("sample_exercise_log.csv 형식 (Parquet/Arrow 가능)", type=["csv", "parquet", "arrow"])
         if eup is not None:
-            eup_df = pd.read_csv(eup)
-            if "kcal_burned" not in eup_df.columns or (eup_df["kcal_burned"].fillna(0)==0).any():
-                kcals = []
-                for _, r in eup_df.iterrows():
-                    kcals.append(kcal_from_walk(str(r.get("activity","걷기(보통)")), float(r.get("minutes",30)), float(r.get("weight_kg",60))))
-                eup_df["kcal_burned"] = kcals
-            st.session_state.exercise_log = pd.concat([st.session_state.exercise_log, eup_df], ignore_index=True)
-            st.success(f"{len(eup_df)}건 업로드됨")
+            # as-of 체중은 체중 기록 사본으로 계산 (작업 중에 체중 기록이 바뀌어도 영향 없음)
+            frozen, weights_digest = session_memo("weights_copy", weights.log.version, lambda: (weights.copy(), weights.digest()))
+            result = ingest_upload(eup, "exercise", st.session_state.exercise_log, EXERCISE_CSV_DTYPES,
+                                   lambda c: enrich_exercise_upload(c, catalog, frozen), depends=weights_digest)
+            if result is not None:
+                unknown = result[1].get("unknown", [])
+                if unknown:
+                    st.warning(f"활동 목록에 없는 활동 {len(unknown)}종은 MET {ActivityCatalog.DEFAULT_MET}로 계산되었습니다: " + ", ".join(unknown[:20]))
+                st.success(f"{result[0]}건 업로드됨")
 
     st.divider()
-    st.subheader("기록된 걷기/운동")
+    st.subheader("기록된 운동")
     if st.session_state.exercise_log.empty:
         st.info("아직 운동 기록이 없습니다.")
     else:
-        st.dataframe(st.session_state.exercise_log.sort_values(["date","activity"]))
+        st.dataframe(st.session_state.exercise_log.frame.sort_values(["date","activity"]))
         day_e = st.date_input("일자별 운동 합계 보기", value=date.today(), key="sum_e_date")
-        edf = st.session_state.exercise_log[st.session_state.exercise_log["date"] == day_e.isoformat()]
-        st.write(f"**{day_e.isoformat()} 소모 열량 합계: {edf['kcal_burned'].sum():.0f} kcal**")
+        day_kcal_out = st.session_state.daily_rollup.day(day_e)["kcal_out"]
+        st.write(f"**{day_e.isoformat()} 소모 열량 합계: {day_kcal_out:.0f} kcal**")
 
 # Exercise guidance
-with tabs[3]:
+@prof.timed("탭: 운동 가이드")
+def guide_tab():
     st.subheader("전방십자인대(ACL) 수술 이력 고려 간단 운동")
     st.write("""
     **주의:** 통증, 부기, 불안정감이 있으면 중단하고 전문의/물리치료사와 상담하세요.  
@@ -260,38 +644,80 @@ with tabs[3]:
     - **RPE**(자각운동강도) 4–6 수준 유지, 통증 3/10 이상 지속 시 강도 감소
     """)
     st.caption("개인 상황에 따라 조절하세요.")
+    st.markdown("**기록할 수 있는 활동** (운동 기록 탭에서 선택)")
+    table = catalog.frame.rename(columns={"activity": "활동", "category": "종류", "met": "MET", "speed_min_kmh": "최저 속도(km/h)",
+                                          "speed_max_kmh": "최고 속도(km/h)", "acl_safe": "무릎 친화", "note": "메모"})
+    st.dataframe(table, hide_index=True, use_container_width=True)
 
 # Weight logging
-with tabs[4]:
+@st.fragment
+@prof.timed("탭: 체중 기록")
+def weight_tab():
     st.subheader("체중 기록")
     w_date = st.date_input("날짜", value=date.today(), key="w_date")
     weight = st.number_input("체중(kg)", min_value=30.0, max_value=200.0, step=0.1, value=60.0)
     note = st.text_input("메모", value="")
     if st.button("체중 기록 추가"):
         new_w = {"date": w_date.isoformat(), "weight_kg": weight, "note": note}
-        st.session_state.weight_log = pd.concat([st.session_state.weight_log, pd.DataFrame([new_w])], ignore_index=True)
+        st.session_state.weight_log.append(new_w)
         st.success("체중이 기록되었습니다.")
+    wup = st.file_uploader("체중 기록 가져오기 (date, weight_kg, note — CSV/Parquet/Arrow)", type=["csv", "parquet", "arrow"])
+    if wup is not None:
+        result = ingest_upload(wup, "weight", st.session_state.weight_log, WEIGHT_CSV_DTYPES, None)
+        if result is not None:
+            st.success(f"{result[0]}건 업로드됨")
     st.divider()
-    if not st.session_state.weight_log.empty:
-        ww = st.session_state.weight_log.sort_values("date").copy()
-        ww["date"] = pd.to_datetime(ww["date"])
-        st.line_chart(ww.set_index("date")["weight_kg"])
+    if not weights.frame().empty:
+        ww = weights.frame()
+        time_series_chart(ww.set_index("date")["weight_kg"], chart_budget)
         st.dataframe(ww)
 
 # Foods DB
-with tabs[5]:
+@st.fragment
+@prof.timed("탭: 음식 DB")
+def foods_tab():
     st.subheader("음식 DB 미리보기")
     st.dataframe(foods_df)
-    st.download_button("현재 음식 DB 다운로드", data=foods_df.to_csv(index=False), file_name="foods_korean.csv", mime="text/csv")
+    if not db.unparsed_servings.empty:
+        with st.expander(f"서빙 그램 정보를 읽지 못한 음식 {len(db.unparsed_servings)}개 (그램 입력 불가)"):
+            st.dataframe(db.unparsed_servings, hide_index=True)
+    d1, d2 = st.columns(2)
+    d1.download_button("현재 음식 DB 다운로드", data=foods_df.drop(columns=SERVING_COLUMNS).to_csv(index=False), file_name="foods_korean.csv", mime="text/csv")
+    d2.download_button("Parquet로 다운로드", data=lambda: columnar.foods_to_bytes(foods_df), file_name="foods_korean.parquet",
+                       on_click="ignore")
     st.markdown("""
     **칼로리 자동 계산 원리**  
     - 각 음식의 기본 서빙 당 칼로리를 DB에서 찾고, 입력한 서빙 수를 곱합니다.  
-    - 음식명이 DB에 없으면 0 kcal로 계산되니, 필요 시 DB를 수정/추가하여 업로드하세요.
+    - 탄수화물·단백질·지방(g)도 같은 방식으로 함께 계산됩니다.  
+    - CSV 업로드 시 DB에 없는 음식명은 공백·괄호·짧은 오타 차이를 무시하고 가장 가까운 DB 음식으로 보정합니다.  
+    - 그래도 찾지 못한 음식은 0 kcal로 계산되고 업로드/재계산 시 목록으로 알려드리니, 필요 시 DB를 수정/추가하여 업로드하세요.
     """)
 
+# 선택된 탭만 실행하고(탭을 바꾸면 다시 실행), 탭 안의 위젯 조작은 그 탭(fragment)만 다시 실행한다.
+tabs = st.tabs(["대시보드", "식단 기록", "운동(걷기) 기록", "운동 가이드", "체중 기록", "음식 DB"], key="active_tab", on_change="rerun")
+for tab, render in zip(tabs, [dashboard_tab, meal_tab, exercise_tab, guide_tab, weight_tab, foods_tab]):
+    with tab:
+        if tab.open:
+            render()
+
 st.sidebar.markdown("""
 ### 사용 팁
 - 아침·저녁은 **요거트, 과일(토마토/사과), 통밀빵, 달걀, 고구마** 등으로 간단히 구성하면 혈당 급등을 줄이는 데 도움이 됩니다.
 - 점심 구내식당은 **현미/잡곡밥 소량 + 단백질 반찬 + 채소 나물** 위주로 선택하세요.
 - 식사 후 10–15분 가벼운 걷기를 권장합니다.
 """)
+
+# 성능 측정 패널: 이번 실행의 구간별 시간과 최근 실행 기록 (탭 안 조작만 다시 실행된 기록은 "부분")
+prof.end()
+with st.sidebar.expander("🔧 성능 측정", expanded=prof.enabled):
+    st.toggle("실행마다 구간 시간·메모리 측정", value=st.query_params.get("debug") == "1", key="profile_on")
+    if prof.enabled:
+        st.checkbox(f"JSONL 파일({PROFILE_LOG})에도 기록", key="profile_log")
+        if prof.history:
+            last = prof.history[-1]
+            st.caption(f"마지막 실행: {last['total_ms']:.0f} ms" + (f" · RSS {last['rss_mb']:.0f} MB" if last["rss_mb"] is not None else ""))
+            st.dataframe(pd.DataFrame(last["sections"], columns=["name", "depth", "ms"]).round({"ms": 1}), hide_index=True, use_container_width=True)
+            st.json(last.get("sizes", {}), expanded=False)
+            recent = pd.DataFrame([{"time": r["time"][11:], "kind": r["kind"], "ms": round(r["total_ms"], 1), "rss_mb": r["rss_mb"]}
+                                   for r in reversed(prof.history)])
+            st.dataframe(recent, hide_index=True, use_container_width=True)
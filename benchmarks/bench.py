@@ -0,0 +1,192 @@
+# carelog 데이터 경로 벤치마크 (브라우저 없이 실행)
+#   python -m benchmarks.bench                      # 기본 크기 → bench_results.json
+#   python -m benchmarks.bench --full -o full.json  # 음식 DB 50k, 로그 1M행까지
+#   python -m benchmarks.bench --compare base.json  # 이전 결과 대비 느려진 항목 표시 (기준 초과 시 종료 코드 1)
+# 합성 데이터(carelog.synthetic)는 seed가 고정되어 실행마다 같다.
+import argparse
+import io
+import json
+import platform
+import subprocess
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from carelog import (EXERCISE_CSV_DTYPES, LOG_SCHEMAS, MEAL_CSV_DTYPES, MEAL_TYPES, ActivityCatalog, DailyRollup, FoodsDB,
+                     LogBuffer, WeightTimeline, apply_meal_edits, compute_trends, copy_range, daily_starts, downsample,
+                     enrich_exercise_upload, enrich_meal_upload, expand_template, import_csv, kcal_from_food, load_activities,
+                     load_foods, template_from_items)
+from carelog.synthetic import synthetic_exercise, synthetic_foods, synthetic_meals, synthetic_weights
+
+ROOT = Path(__file__).resolve().parent.parent
+SIZES = {
+    "quick": {"foods": [100, 5_000], "logs": [1_000, 100_000]},
+    "full": {"foods": [100, 5_000, 50_000], "logs": [1_000, 100_000, 1_000_000]},
+}
+
+class Bench:
+    # 이름·파라미터별로 fn을 여러 번 실행해 최솟값·중앙값(초)을 모은다.
+    def __init__(self, repeat):
+        self.repeat = repeat
+        self.results = []
+
+    def run(self, name, fn, setup=None, repeat=None, **params):
+        times = []
+        for _ in range(repeat or self.repeat):
+            arg = setup() if setup is not None else None
+            start = time.perf_counter()
+            fn(arg) if setup is not None else fn()
+            times.append(time.perf_counter() - start)
+        row = {"name": name, "params": params, "min_s": min(times), "median_s": float(np.median(times)), "runs": len(times)}
+        self.results.append(row)
+        label = " ".join(f"{k}={v:,}" if isinstance(v, int) else f"{k}={v}" for k, v in params.items())
+        print(f"{name:<28} {label:<32} min {row['min_s'] * 1e3:10.2f} ms", file=sys.stderr)
+        return row
+
+def csv_bytes(frame):
+    return io.BytesIO(frame.to_csv(index=False).encode())
+
+def meal_log(foods, rows):
+    log = LogBuffer(LOG_SCHEMAS["meal_log"], categories={"meal": MEAL_TYPES, "food": foods.index.names})
+    import_csv(csv_bytes(rows), log, MEAL_CSV_DTYPES, lambda c: enrich_meal_upload(c, foods.index))
+    return log
+
+def bench_foods(b, n):
+    raw = synthetic_foods(n).to_csv(index=False).encode()
+    b.run("load_foods", lambda: load_foods(io.BytesIO(raw)), foods=n)
+    foods = FoodsDB(str(n), load_foods(io.BytesIO(raw)))
+    names = foods.index.names.to_numpy()
+    picks = names[np.random.default_rng(1).integers(0, len(names), 10_000)]
+    b.run("kcal_from_food.scalar", lambda: [kcal_from_food(foods.index, name, 1.5) for name in picks], foods=n, calls=len(picks))
+    b.run("FoodIndex.batch", lambda: foods.index.batch(picks, 1.5), foods=n, rows=len(picks))
+    return foods
+
+def bench_logs(b, foods, catalog, n):
+    meals = synthetic_meals(n, foods.frame, seed=n)
+    exercise = synthetic_exercise(max(1, n // 4), catalog.names, seed=n)
+    weights = synthetic_weights(max(1, n // 4), seed=n)
+    repeat = 1 if n >= 1_000_000 else None
+
+    # CSV 업로드: 청크 읽기 + 음식명 보정 + kcal·탄단지 계산 + 로그 추가
+    meal_csv = meals.to_csv(index=False).encode()
+    b.run("upload.meal_csv", lambda log: import_csv(io.BytesIO(meal_csv), log, MEAL_CSV_DTYPES,
+                                                    lambda c: enrich_meal_upload(c, foods.index, foods.search)),
+          setup=lambda: LogBuffer(LOG_SCHEMAS["meal_log"], categories={"meal": MEAL_TYPES, "food": foods.index.names}),
+          repeat=repeat, foods=len(foods.frame), rows=n)
+    weight_log = LogBuffer(LOG_SCHEMAS["weight_log"])
+    weight_log.extend(weights)
+    timeline = WeightTimeline(weight_log)
+    ex_csv = exercise.to_csv(index=False).encode()
+    b.run("upload.exercise_csv", lambda log: import_csv(io.BytesIO(ex_csv), log, EXERCISE_CSV_DTYPES,
+                                                        lambda c: enrich_exercise_upload(c, catalog, timeline)),
+          setup=lambda: LogBuffer(LOG_SCHEMAS["exercise_log"], categories={"activity": catalog.names}),
+          repeat=repeat, rows=len(exercise))
+
+    log = meal_log(foods, meals)
+    ex_log = LogBuffer(LOG_SCHEMAS["exercise_log"], categories={"activity": catalog.names})
+    import_csv(io.BytesIO(ex_csv), ex_log, EXERCISE_CSV_DTYPES, lambda c: enrich_exercise_upload(c, catalog, timeline))
+
+    # 표 편집 저장: 한 페이지(50행) 중 10행 수정, 2행 추가, 3행 삭제
+    def edit_setup():
+        view = log.take(log.ids[-50:])
+        names = foods.index.names
+        edits = {
+            "edited_rows": {i: {"servings": 2.0} if i % 2 else {"food": names[i % len(names)]} for i in range(10)},
+            "added_rows": [{"date": "2024-01-01", "meal": "점심", "food": names[0], "servings": 1.0}] * 2,
+            "deleted_rows": [40, 41, 42],
+        }
+        return view, edits
+    b.run("save.meal_edits", lambda arg: apply_meal_edits(log, arg[0], arg[1], foods.index), setup=edit_setup, rows=n)
+    # 편집기에서 한 행만 삭제해 저장 (비용이 로그 크기와 무관해야 함. --full이면 100만행까지)
+    b.run("save.delete_one_row", lambda view: apply_meal_edits(log, view, {"deleted_rows": [0]}, foods.index),
+          setup=lambda: log.take(log.ids[len(log) // 2:len(log) // 2 + 50]), rows=n)
+
+    # 템플릿 한 달 채우기, 한 주 식단을 4주 반복 (날짜 색인 조회 + 한 번에 추가)
+    template = template_from_items(foods.index, [(MEAL_TYPES[i % 4], name, 1.0) for i, name in enumerate(foods.index.names[:8])])
+    month = daily_starts("2030-01-01", "2030-01-31")
+    b.run("template.month", lambda: log.extend(expand_template(template, month)), rows=n)
+    last = log.frame["date"].max()
+    b.run("copy_range.week_x4", lambda: copy_range(log, last - pd.Timedelta(days=6), last, last + pd.Timedelta(days=1), repeat=4), rows=n)
+    b.run("ids_between.week", lambda: log.ids_between(last - pd.Timedelta(days=6), last), rows=n)
+
+    # 날짜별 합계: 전체 다시 만들기 / 한 행 추가 시 증분 갱신
+    def build_rollup():
+        rollup = DailyRollup()
+        rollup.update("meal", None, log.frame)
+        rollup.update("exercise", None, ex_log.frame)
+        return rollup
+    b.run("rollup.build", build_rollup, rows=n)
+    rollup = build_rollup()
+    one = log.frame.iloc[:1]
+    b.run("rollup.incremental", lambda: rollup.update("meal", None, one), rows=n)
+    b.run("rollup.frame", lambda: (setattr(rollup, "_frame", None), rollup.frame()), rows=n)
+
+    # 차트 준비: 주간/월간 추세, LTTB 다운샘플
+    daily = rollup.frame()
+    b.run("trends.weekly", lambda: compute_trends(daily, weight_log.frame, "W"), rows=n)
+    b.run("trends.monthly", lambda: compute_trends(daily, weight_log.frame, "MS"), rows=n)
+    b.run("chart.downsample", lambda: downsample(daily[["kcal_in", "kcal_out", "balance"]], 500), rows=n)
+
+def git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def compare(results, baseline_path, threshold):
+    # 같은 이름·파라미터의 min_s를 비교해 threshold배 이상 느려진 항목 수를 돌려준다.
+    baseline = {(r["name"], json.dumps(r["params"], sort_keys=True)): r for r in json.loads(Path(baseline_path).read_text())["results"]}
+    slower = 0
+    for r in results:
+        base = baseline.get((r["name"], json.dumps(r["params"], sort_keys=True)))
+        if base is None:
+            continue
+        ratio = r["min_s"] / base["min_s"] if base["min_s"] > 0 else float("inf")
+        flag = "  ← 느려짐" if ratio >= threshold else ""
+        slower += bool(flag)
+        print(f"{r['name']:<28} {json.dumps(r['params'], ensure_ascii=False):<40} {ratio:6.2f}x{flag}")
+    return slower
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="benchmarks.bench", description="carelog 데이터 경로 벤치마크")
+    parser.add_argument("--full", action="store_true", help="큰 크기까지 (음식 DB 50k, 로그 1M행)")
+    parser.add_argument("--repeat", type=int, default=5, help="항목별 반복 횟수 (기본 5, 최솟값 사용)")
+    parser.add_argument("-o", "--out", type=Path, default=Path("bench_results.json"), help="결과 JSON (기본: bench_results.json)")
+    parser.add_argument("--compare", type=Path, help="비교할 이전 결과 JSON")
+    parser.add_argument("--threshold", type=float, default=1.25, help="이 배수 이상 느려지면 회귀로 표시 (기본 1.25)")
+    args = parser.parse_args(argv)
+
+    sizes = SIZES["full" if args.full else "quick"]
+    b = Bench(args.repeat)
+    catalog = ActivityCatalog(load_activities(ROOT / "activities_korean.csv"))
+    for n_foods in sizes["foods"]:
+        foods = bench_foods(b, n_foods)
+    # 로그 경로는 가장 큰 음식 DB로 (이름 조회 비용이 가장 큰 경우)
+    for n_rows in sizes["logs"]:
+        bench_logs(b, foods, catalog, n_rows)
+
+    report = {
+        "meta": {
+            "created": datetime.now().isoformat(timespec="seconds"),
+            "git": git_revision(),
+            "python": platform.python_version(),
+            "pandas": pd.__version__,
+            "numpy": np.__version__,
+            "machine": platform.machine(),
+            "sizes": sizes,
+            "repeat": args.repeat,
+        },
+        "results": b.results,
+    }
+    args.out.write_text(json.dumps(report, ensure_ascii=False, indent=1))
+    print(f"{len(b.results)}개 항목 → {args.out}", file=sys.stderr)
+    if args.compare:
+        return 1 if compare(b.results, args.compare, args.threshold) else 0
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
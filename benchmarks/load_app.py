@@ -0,0 +1,246 @@
+# 앱 부하 테스트: streamlit.testing의 AppTest로 `app (5).py` 세션 N개를 한 프로세스에서 띄워
+# 프리셋·단건 추가·CSV 업로드·표 편집/삭제·탭 이동·되돌리기를 무작위 순서로 번갈아 실행한다 (브라우저·네트워크 없음).
+# 동작별 지연 시간 분위수(p50/p90/p99)와 세션 수·기록 크기에 따른 메모리(RSS) 증가를 보고한다.
+#   python -m benchmarks.load_app                                   # 세션 1/4/8개 × 기록 0/5천행 → load_results.json
+#   python -m benchmarks.load_app --sessions 20 --history 20000 --steps 30
+# 세션들은 실제 서버처럼 캐시(음식 DB 등)를 공유하고, 스크립트 실행은 한 번에 하나씩 돌아가며 한다.
+import argparse
+import gc
+import json
+import os
+import platform
+import sys
+import time
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+from streamlit.testing.v1 import AppTest
+
+from carelog import rss_bytes
+from carelog.snapshot import FOOD_SOURCES, SNAPSHOT_FILE, load_bundled_foods
+from carelog.synthetic import synthetic_exercise, synthetic_meals
+
+from .bench import git_revision
+
+ROOT = Path(__file__).resolve().parent.parent
+APP = ROOT / "app (5).py"
+# 동작 → (탭, 가중치)
+ACTIONS = {
+    "preset": ("식단 기록", 2),
+    "add_meal": ("식단 기록", 3),
+    "upload_meal": ("식단 기록", 1),
+    "edit_meals": ("식단 기록", 2),
+    "delete_meals": ("식단 기록", 1),
+    "add_exercise": ("운동(걷기) 기록", 2),
+    "add_weight": ("체중 기록", 1),
+    "dashboard": ("대시보드", 2),
+    "undo": (None, 1),
+}
+
+class Session:
+    # AppTest 한 개 = 브라우저 탭 한 개. 탭 이동 후 버튼을 누를 때마다 선택 탭을 다시 지정한다.
+    def __init__(self, seed, timeout):
+        self.at = AppTest.from_file(str(APP), default_timeout=timeout)
+        self.tab = "대시보드"
+        self.rng = np.random.default_rng(seed)
+        self.uploads = 0
+
+    def run(self, tab=None):
+        self.at.session_state["active_tab"] = tab or self.tab
+        start = time.perf_counter()
+        self.at.run()
+        elapsed = time.perf_counter() - start
+        if self.at.exception:
+            raise RuntimeError("\n".join(e.message for e in self.at.exception))
+        return elapsed
+
+    def goto(self, tab):
+        # 다른 탭으로 이동 (이동도 한 번의 실행). 같은 탭이면 0
+        if tab is None or tab == self.tab:
+            return 0.0
+        self.tab = tab
+        return self.run()
+
+    def click(self, label):
+        for b in self.at.button:
+            if b.label == label or b.label.startswith(label + "("):
+                b.click()
+                return self.run()
+        raise LookupError(f"button not found: {label}")
+
+    def upload(self, prefix, name, data):
+        # 업로드는 백그라운드 작업으로 돌므로, 결과가 로그에 반영될 때까지 다시 실행하며 기다린 시간까지 잰다
+        for u in self.at.file_uploader:
+            if u.label.startswith(prefix):
+                u.set_value((name, data, "text/csv"))
+                elapsed = self.run()
+                while self.at.session_state["upload_jobs"]:
+                    start = time.perf_counter()
+                    time.sleep(0.01)
+                    elapsed += time.perf_counter() - start + self.run()
+                return elapsed
+        raise LookupError(f"uploader not found: {prefix}")
+
+    def editor(self):
+        # 식단 편집기 (key, 표시된 표). 기록이 없으면 None
+        for el in self.at.main.get("dataframe"):
+            key = el.proto.id.split("-", 2)[-1]
+            if key.startswith("meal_editor_"):
+                return key, el.value
+        return None
+
+    def save_edits(self, make_edits):
+        found = self.editor()
+        if found is None or found[1].empty:
+            return None
+        key, shown = found
+        self.at.session_state[key] = make_edits(shown)
+        return self.click("변경사항 저장")
+
+def meal_csv(names, rows, seed, days):
+    # 오늘까지 days일에 걸친 식단 CSV (세션·회차마다 seed를 달리해 같은 파일로 보이지 않게 한다)
+    frame = synthetic_meals(rows, names, seed=seed, start=(date.today() - timedelta(days=days - 1)).isoformat(),
+                            per_day=max(1, -(-rows // days)))
+    return frame.to_csv(index=False).encode()
+
+def act(session, action, names):
+    # 동작 하나 실행 → 걸린 시간(초). 할 수 없는 상태(편집할 행 없음 등)면 None
+    tab, _ = ACTIONS[action]
+    session.goto(tab)
+    rng = session.rng
+    if action == "preset":
+        return session.click("아침 프리셋")
+    if action == "add_meal":
+        return session.click("기록 추가")
+    if action == "upload_meal":
+        session.uploads += 1
+        data = meal_csv(names, 200, seed=int(rng.integers(1 << 31)), days=7)
+        return session.upload("sample_meal_log", f"meals_{session.uploads}.csv", data)
+    if action == "edit_meals":
+        return session.save_edits(lambda shown: {
+            "edited_rows": {int(i): {"servings": float(rng.choice([0.5, 1.5, 2.0]))}
+                            for i in rng.choice(len(shown), min(3, len(shown)), replace=False)},
+            "added_rows": [], "deleted_rows": []})
+    if action == "delete_meals":
+        return session.save_edits(lambda shown: {
+            "edited_rows": {}, "added_rows": [],
+            "deleted_rows": sorted(int(i) for i in rng.choice(len(shown), min(2, len(shown)), replace=False))})
+    if action == "add_exercise":
+        return session.click("운동 기록 추가")
+    if action == "add_weight":
+        return session.click("체중 기록 추가")
+    if action == "dashboard":
+        return session.run()
+    if action == "undo":
+        return session.click("↩ 되돌리기")
+    raise ValueError(action)
+
+def seed_history(session, names, activities, rows, seed):
+    # 세션 시작 시 기존 기록을 CSV 업로드로 채운다 (식단 rows행, 운동 rows/4행, 하루 4끼)
+    if rows <= 0:
+        return
+    session.goto("식단 기록")
+    session.upload("sample_meal_log", "history_meals.csv", meal_csv(names, rows, seed, days=max(1, rows // 4)))
+    ex = synthetic_exercise(max(1, rows // 4), activities, seed=seed,
+                            start=(date.today() - timedelta(days=max(1, rows // 4) - 1)).isoformat())
+    session.goto("운동(걷기) 기록")
+    session.upload("sample_exercise_log", "history_exercise.csv", ex.to_csv(index=False).encode())
+
+def percentiles(times):
+    ms = np.asarray(times) * 1e3
+    return {"n": len(ms), "p50_ms": float(np.percentile(ms, 50)), "p90_ms": float(np.percentile(ms, 90)),
+            "p99_ms": float(np.percentile(ms, 99)), "max_ms": float(ms.max())}
+
+def scenario(n_sessions, history, steps, names, activities, seed, timeout):
+    gc.collect()
+    rss0 = rss_bytes()
+    times = {}
+    sessions = []
+    for i in range(n_sessions):
+        s = Session(seed + i, timeout)
+        times.setdefault("open", []).append(s.run())
+        seed_history(s, names, activities, history, seed + i)
+        sessions.append(s)
+    rss_seeded = rss_bytes()
+    actions = list(ACTIONS)
+    weights = np.array([w for _, w in ACTIONS.values()], dtype=float)
+    rng = np.random.default_rng(seed)
+    # 세션들을 돌아가며 한 동작씩 (동시 접속자가 번갈아 누르는 상황)
+    for _ in range(steps):
+        for s in sessions:
+            action = actions[rng.choice(len(actions), p=weights / weights.sum())]
+            elapsed = act(s, action, names)
+            if elapsed is not None:
+                times.setdefault(action, []).append(elapsed)
+    gc.collect()
+    rss1 = rss_bytes()
+    logs_kb = sum(s.at.session_state[key].nbytes for s in sessions for key in ["meal_log", "exercise_log", "weight_log"]) / 1024
+    rows = sum(len(s.at.session_state["meal_log"]) for s in sessions)
+    mb = lambda b: None if b is None else b / 2**20
+    result = {
+        "sessions": n_sessions, "history": history, "steps": steps,
+        "meal_rows": rows, "logs_kb": round(logs_kb, 1),
+        "rss_start_mb": mb(rss0), "rss_seeded_mb": mb(rss_seeded), "rss_end_mb": mb(rss1),
+        "rss_growth_mb": None if rss0 is None else mb(rss1 - rss0),
+        "rss_per_session_mb": None if rss0 is None else mb(rss1 - rss0) / n_sessions,
+        "actions": {name: percentiles(t) for name, t in sorted(times.items())},
+    }
+    del sessions
+    return result
+
+def print_scenario(r):
+    growth = "" if r["rss_growth_mb"] is None else f", RSS +{r['rss_growth_mb']:.0f} MB ({r['rss_per_session_mb']:.1f} MB/세션)"
+    print(f"\n세션 {r['sessions']}개 × 기록 {r['history']:,}행: 식단 {r['meal_rows']:,}행, 로그 배열 {r['logs_kb']:,.0f} KB{growth}")
+    print(f"  {'동작':<14}{'횟수':>6}{'p50':>10}{'p90':>10}{'p99':>10}{'max':>10}  (ms)")
+    for name, p in r["actions"].items():
+        print(f"  {name:<14}{p['n']:>6}{p['p50_ms']:>10.1f}{p['p90_ms']:>10.1f}{p['p99_ms']:>10.1f}{p['max_ms']:>10.1f}")
+
+def int_list(text):
+    return [int(v) for v in text.split(",") if v.strip()]
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="benchmarks.load_app", description="AppTest 다중 세션 부하 테스트")
+    parser.add_argument("--sessions", type=int_list, default=[1, 4, 8], help="동시 세션 수 목록 (쉼표 구분, 기본 1,4,8)")
+    parser.add_argument("--history", type=int_list, default=[0, 5000], help="세션별 기존 식단 행 수 목록 (기본 0,5000)")
+    parser.add_argument("--steps", type=int, default=10, help="세션별 동작 횟수 (기본 10)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--timeout", type=float, default=120, help="실행 한 번의 제한 시간(초)")
+    parser.add_argument("-o", "--out", type=Path, default=Path("load_results.json"), help="결과 JSON (기본: load_results.json)")
+    args = parser.parse_args(argv)
+
+    out = args.out.resolve()
+    # 앱은 자기 폴더 기준 상대 경로로 파일을 읽는다
+    os.chdir(ROOT)
+    foods, _, _ = load_bundled_foods([p for p in FOOD_SOURCES if Path(p).exists()], SNAPSHOT_FILE)
+    names = foods["food"]
+    activities = pd.read_csv("activities_korean.csv")["activity"]
+    # 첫 실행의 모듈 import·공유 캐시(음식 DB) 적재가 첫 시나리오 메모리에 섞이지 않도록 한 번 띄워 둔다
+    Session(args.seed, args.timeout).run()
+    results = []
+    for history in args.history:
+        for n in args.sessions:
+            r = scenario(n, history, args.steps, names, activities, args.seed, args.timeout)
+            print_scenario(r)
+            results.append(r)
+    report = {
+        "meta": {
+            "created": datetime.now().isoformat(timespec="seconds"),
+            "git": git_revision(),
+            "python": platform.python_version(),
+            "streamlit": st.__version__,
+            "pandas": pd.__version__,
+            "machine": platform.machine(),
+            "steps": args.steps,
+            "seed": args.seed,
+        },
+        "scenarios": results,
+    }
+    out.write_text(json.dumps(report, ensure_ascii=False, indent=1))
+    print(f"\n{len(results)}개 시나리오 → {out}", file=sys.stderr)
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
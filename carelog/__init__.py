@@ -0,0 +1,15 @@
+# 체중·식단·운동 관리 계산 모듈 (Streamlit 없이 사용 가능)
+# 앱(app (5).py)과 일괄 리포트 CLI(python -m carelog)가 함께 쓴다.
+# Parquet/Arrow 입출력은 carelog.columnar (pyarrow 필요)
+from .activities import DEFAULT_WEIGHT_KG, ActivityCatalog, enrich_exercise_upload, load_activities
+from .foods import SERVING_COLUMNS, FoodIndex, FoodsDB, clean_foods, load_foods, parse_servings
+from .jobs import Job, JobCancelled, JobPool
+from .logs import (CSV_CHUNK_ROWS, EXERCISE_CSV_DTYPES, LOG_SCHEMAS, MEAL_CSV_DTYPES, MEAL_TYPES, WEIGHT_CSV_DTYPES,
+                   LogBuffer, OpJournal, SqliteLogStore, import_chunks, import_csv)
+from .meals import apply_meal_edits, enrich_meal_upload, enrich_meals, kcal_from_food, meal_row
+from .profiling import RerunProfiler, rss_bytes
+from .report import summarize, user_logs, user_report
+from .rollup import DailyRollup, WeightTimeline
+from .search import FoodSearch, edit_distance, normalize_name, to_choseong
+from .templates import copy_range, daily_starts, expand_template, template_from_items, template_from_rows
+from .trends import compute_trends, downsample, lttb_indices
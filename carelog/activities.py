@@ -0,0 +1,63 @@
+# 운동 활동 목록(MET)과 소모 열량 계산
+import numpy as np
+import pandas as pd
+
+DEFAULT_WEIGHT_KG = 60.0
+
+def load_activities(source):
+    # 활동 목록 CSV(경로 또는 파일 객체)를 읽어 검증·정리: 활동명 공백 제거, MET·속도 수치 변환, 중복 이름은 첫 행만
+    df = pd.read_csv(source)
+    needed = {"activity","met"}
+    if not needed.issubset(df.columns):
+        raise ValueError("activities CSV must have columns: " + ", ".join(needed))
+    df["activity"] = df["activity"].astype(str).str.strip()
+    df["met"] = pd.to_numeric(df["met"], errors="coerce")
+    for c in ["speed_min_kmh", "speed_max_kmh"]:
+        df[c] = pd.to_numeric(df[c], errors="coerce") if c in df.columns else np.nan
+    df["acl_safe"] = df["acl_safe"].fillna(0).astype(bool) if "acl_safe" in df.columns else False
+    for c in ["category", "note"]:
+        df[c] = df[c].fillna("").astype(str) if c in df.columns else ""
+    df = df[(df["activity"] != "") & df["met"].notna()].drop_duplicates("activity", keep="first").reset_index(drop=True)
+    return df
+
+class ActivityCatalog:
+    # 활동명 → MET 조회. 소모 열량 = MET × 3.5 × 체중(kg) ÷ 200 × 분 (배열 단위로 계산)
+    DEFAULT_MET = 3.5
+
+    def __init__(self, frame):
+        self.frame = frame
+        self.names = pd.Index(frame["activity"])
+        self.mets = frame["met"].to_numpy(dtype=float)
+
+    def __contains__(self, name):
+        return name in self.names
+
+    def met(self, activities):
+        # 활동명 배열 → MET 배열 (목록에 없는 활동은 DEFAULT_MET)
+        pos = self.names.get_indexer(pd.Index(np.atleast_1d(np.asarray(activities, dtype=object))))
+        return np.where(pos >= 0, self.mets[pos], self.DEFAULT_MET)
+
+    def burn(self, activities, minutes, weight_kg):
+        return self.met(activities) * 3.5 * np.asarray(weight_kg, dtype=float) / 200.0 * np.asarray(minutes, dtype=float)
+
+    def info(self, name):
+        return self.frame.iloc[self.names.get_loc(name)]
+
+def enrich_exercise_upload(chunk, catalog, weights=None):
+    # kcal_burned가 비었거나 0인 행만 활동 목록의 MET로 계산
+    # 체중이 빈 행은 weights(WeightTimeline)에서 그 날짜의 as-of 체중으로 채운다 (없으면 60kg)
+    # 반환 보고서의 unknown: 활동 목록에 없어 기본 MET로 계산한 활동명
+    if "activity" not in chunk.columns:
+        chunk["activity"] = "걷기(보통)"
+    minutes = chunk["minutes"].to_numpy(dtype=float) if "minutes" in chunk.columns else np.full(len(chunk), 30.0)
+    weight = chunk["weight_kg"].to_numpy(dtype=float, copy=True) if "weight_kg" in chunk.columns else np.full(len(chunk), np.nan)
+    no_weight = np.isnan(weight)
+    if no_weight.any():
+        weight[no_weight] = weights.asof(chunk["date"].to_numpy()[no_weight]) if weights is not None else DEFAULT_WEIGHT_KG
+    burned = chunk["kcal_burned"].to_numpy(dtype=float, copy=True) if "kcal_burned" in chunk.columns else np.full(len(chunk), np.nan)
+    missing = np.isnan(burned) | (burned == 0)
+    activities = chunk["activity"].to_numpy(dtype=object)
+    burned[missing] = catalog.burn(activities[missing], minutes[missing], weight[missing])
+    chunk["kcal_burned"], chunk["minutes"], chunk["weight_kg"] = burned, minutes, weight
+    unknown = pd.unique(chunk["activity"][missing & ~chunk["activity"].isin(catalog.names).to_numpy()].dropna())
+    return chunk, {"unknown": sorted(map(str, unknown))}
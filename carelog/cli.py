@@ -0,0 +1,77 @@
+# 일괄 리포트 CLI: 사용자별 폴더의 식단·운동·체중 CSV → 사용자별 날짜 합계 + 전체 요약
+#   python -m carelog USERS_DIR -o reports/ [--foods my_foods.csv] [--activities activities_korean.csv] [-j 8]
+# 음식 DB는 기본으로 앱과 같은 합친 DB(FOOD_SOURCES, 스냅샷이 최신이면 스냅샷)를 쓴다.
+import argparse
+import hashlib
+import io
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import pandas as pd
+
+from .activities import ActivityCatalog, load_activities
+from .foods import FoodsDB, load_foods
+from .report import user_report
+
+# 작업 프로세스마다 한 번만 읽는 음식 DB·활동 목록
+_worker = {}
+
+def _init_worker(foods_path, activities_path):
+    if foods_path is None:
+        # 스냅샷 읽기에 pyarrow가 필요해 여기서 가져온다 (--foods CSV만 쓸 때는 필요 없음)
+        from .snapshot import FOOD_SOURCES, SNAPSHOT_FILE, load_bundled_foods
+        frame, digest, _ = load_bundled_foods([p for p in FOOD_SOURCES if Path(p).exists()], SNAPSHOT_FILE)
+        _worker["foods"] = FoodsDB(digest, frame)
+    else:
+        data = Path(foods_path).read_bytes()
+        _worker["foods"] = FoodsDB(hashlib.sha256(data).hexdigest(), load_foods(io.BytesIO(data)))
+    _worker["catalog"] = ActivityCatalog(load_activities(activities_path))
+
+def _run_user(user_dir, out_dir):
+    # 사용자 한 명 처리. 실패해도 전체 작업은 계속되도록 오류를 요약 줄에 담아 돌려준다.
+    try:
+        summary, daily = user_report(user_dir, _worker["foods"], _worker["catalog"])
+    except Exception as e:
+        return {"user": Path(user_dir).name, "error": f"{type(e).__name__}: {e}"}
+    daily.to_csv(Path(out_dir) / f"{summary['user']}_daily.csv", float_format="%.1f")
+    return summary
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="carelog", description="사용자별 식단·운동·체중 CSV 폴더로 요약 리포트를 만듭니다.")
+    parser.add_argument("users_dir", type=Path, help="사용자별 하위 폴더가 있는 폴더")
+    parser.add_argument("-o", "--out", type=Path, default=Path("reports"), help="리포트 출력 폴더 (기본: reports)")
+    parser.add_argument("--foods", type=Path, default=None,
+                        help="음식 DB CSV (기본: 앱과 같이 foods_korean.csv와 \"foods_korean (1).csv\"를 합친 DB, 최신 스냅샷이 있으면 스냅샷)")
+    parser.add_argument("--activities", type=Path, default=Path("activities_korean.csv"), help="활동 목록 CSV")
+    parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count(), help="동시에 처리할 프로세스 수 (기본: CPU 수)")
+    args = parser.parse_args(argv)
+
+    user_dirs = sorted(p for p in args.users_dir.iterdir() if p.is_dir())
+    if not user_dirs:
+        parser.error(f"{args.users_dir}에 사용자 폴더가 없습니다.")
+    if args.foods is None and not Path("foods_korean.csv").exists():
+        parser.error("foods_korean.csv가 없습니다. 현재 폴더를 앱 폴더로 바꾸거나 --foods로 음식 DB를 지정하세요.")
+    args.out.mkdir(parents=True, exist_ok=True)
+    # 음식 DB·활동 목록은 시작 전에 한 번 검증해 잘못된 파일이면 바로 멈춘다.
+    _init_worker(args.foods, args.activities)
+
+    jobs = max(1, min(args.jobs or 1, len(user_dirs)))
+    if jobs == 1:
+        rows = [_run_user(d, args.out) for d in user_dirs]
+    else:
+        with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker, initargs=(args.foods, args.activities)) as pool:
+            rows = list(pool.map(_run_user, user_dirs, [args.out] * len(user_dirs), chunksize=max(1, len(user_dirs) // (jobs * 4))))
+
+    failed = [r for r in rows if "error" in r]
+    for r in failed:
+        print(f"[{r['user']}] {r['error']}", file=sys.stderr)
+    summary = pd.DataFrame([r for r in rows if "error" not in r] + failed)
+    # 실패한 사용자 줄이 섞여도 건수 컬럼은 정수로
+    for c in ["days", "meals", "exercises", "unmatched_foods", "unknown_activities"]:
+        if c in summary.columns:
+            summary[c] = summary[c].astype("Int64")
+    summary.to_csv(args.out / "summary.csv", index=False, float_format="%.1f")
+    print(f"{len(rows) - len(failed)}/{len(rows)}명 리포트 완료 → {args.out}")
+    return 1 if failed else 0
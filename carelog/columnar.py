@@ -0,0 +1,163 @@
+# Parquet / Arrow IPC 가져오기·내보내기 (로그 3종, 음식 DB)
+# 로그 스키마(LOG_SCHEMAS)를 Arrow 타입으로 그대로 저장해 다시 읽을 때 타입 추론이 없다.
+#   date → date32, category → dictionary(int32, string), float32 → float32, text → string (+ 행 ID int64)
+# pyarrow가 필요하다 (streamlit 설치 시 함께 설치됨).
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+from .foods import SERVING_COLUMNS, clean_foods
+from .logs import LOG_SCHEMAS
+
+ARROW_TYPES = {
+    "date": pa.date32(),
+    "category": pa.dictionary(pa.int32(), pa.string()),
+    "float32": pa.float32(),
+    "text": pa.string(),
+}
+# 파일 확장자 → 형식
+FORMATS = {".parquet": "parquet", ".pq": "parquet", ".arrow": "arrow", ".feather": "arrow", ".ipc": "arrow"}
+# 날짜 조건으로 건너뛸 수 있도록 Parquet 행 그룹을 작게 나눈다
+ROW_GROUP_ROWS = 64_000
+
+def file_format(name):
+    # 파일명 확장자로 형식 판단 ("parquet" / "arrow"), 해당 없으면 None
+    return FORMATS.get(Path(str(name)).suffix.lower())
+
+def log_schema(table):
+    fields = [pa.field("id", pa.int64())]
+    fields += [pa.field(c, ARROW_TYPES[kind]) for c, kind in LOG_SCHEMAS[table].items()]
+    return pa.schema(fields, metadata={"carelog.table": table})
+
+def log_to_arrow(frame, table):
+    # LogBuffer 프레임(index = 행 ID) → Arrow 테이블
+    schema = log_schema(table)
+    arrays = [pa.array(frame.index.to_numpy(dtype=np.int64))]
+    for c, kind in LOG_SCHEMAS[table].items():
+        values = frame[c]
+        if kind == "date":
+            arr = pa.array(values.to_numpy(dtype="datetime64[ns]"), type=pa.timestamp("ns")).cast(pa.date32())
+        elif kind == "category":
+            arr = pa.DictionaryArray.from_arrays(pa.array(values.cat.codes.to_numpy(dtype=np.int32), mask=values.isna().to_numpy()),
+                                                 pa.array(values.cat.categories.astype(str), type=pa.string()))
+        else:
+            arr = pa.array(values.to_numpy(), type=ARROW_TYPES[kind], from_pandas=True)
+        arrays.append(arr)
+    return pa.Table.from_arrays(arrays, schema=schema)
+
+def arrow_to_log(tbl, table):
+    # Arrow 테이블 → 로그 스키마 프레임 (파일에 없는 컬럼은 빈 값, index = 저장된 행 ID)
+    out = {}
+    for c, kind in LOG_SCHEMAS[table].items():
+        if c not in tbl.column_names:
+            continue
+        col = tbl.column(c)
+        if kind == "date":
+            out[c] = pd.Series(col.cast(pa.timestamp("ns")).to_numpy(zero_copy_only=False), dtype="datetime64[ns]")
+        elif kind == "category":
+            out[c] = col.to_pandas().astype("category")
+        elif kind == "float32":
+            out[c] = pd.Series(col.cast(pa.float32()).to_numpy(zero_copy_only=False), dtype=np.float32)
+        else:
+            out[c] = col.to_pandas().astype(object)
+    frame = pd.DataFrame(out)
+    if "id" in tbl.column_names:
+        frame.index = pd.Index(tbl.column("id").to_numpy(), name="id")
+    return frame
+
+def write_log(frame, table, dest, fmt="parquet"):
+    # 로그 프레임을 Parquet(zstd) 또는 Arrow IPC 파일로 쓴다. dest: 경로 또는 쓰기용 파일 객체(pyarrow 스트림)
+    tbl = log_to_arrow(frame, table)
+    if fmt == "parquet":
+        pq.write_table(tbl, dest, compression="zstd", row_group_size=ROW_GROUP_ROWS)
+    else:
+        # Arrow IPC는 압축하지 않는다 (메모리 맵으로 복사 없이 읽기 위해)
+        with pa.ipc.new_file(dest, tbl.schema) as writer:
+            writer.write_table(tbl)
+
+def _date_filter(start, end):
+    # 날짜 구간 [start, end] → Parquet 필터 (행 그룹 통계로 해당 없는 그룹은 읽지 않음)
+    filters = []
+    if start is not None:
+        filters.append(("date", ">=", pd.Timestamp(start).date()))
+    if end is not None:
+        filters.append(("date", "<=", pd.Timestamp(end).date()))
+    return filters or None
+
+def _open_arrow(source):
+    # Arrow IPC 파일 열기. 경로면 메모리 맵으로 열어 필요한 컬럼만 읽는다.
+    if isinstance(source, (str, Path)):
+        return pa.ipc.open_file(pa.memory_map(str(source), "r"))
+    data = source.getvalue() if hasattr(source, "getvalue") else source.read()
+    return pa.ipc.open_file(pa.BufferReader(data))
+
+def read_log(source, table, fmt=None, columns=None, start=None, end=None):
+    # 로그 파일 읽기. columns: 읽을 컬럼만 (없으면 스키마 전체), start/end: 날짜 구간
+    # Parquet는 컬럼·날짜 조건을 파일 읽기 단계에서 적용하고, Arrow IPC는 메모리 맵 위에서 거른다.
+    fmt = fmt or file_format(getattr(source, "name", source))
+    wanted = ["id"] + [c for c in LOG_SCHEMAS[table] if columns is None or c in columns]
+    if fmt == "parquet":
+        present = pq.read_schema(source).names
+        if hasattr(source, "seek"):
+            source.seek(0)
+        cols = [c for c in wanted if c in present]
+        filters = _date_filter(start, end) if "date" in present else None
+        tbl = pq.read_table(source, columns=cols, filters=filters)
+    elif fmt == "arrow":
+        tbl = _open_arrow(source).read_all()
+        # 날짜 조건을 먼저 적용한 뒤 컬럼을 고른다 (columns에 date가 없어도 구간으로 거름)
+        if "date" in tbl.column_names and (start is not None or end is not None):
+            d = tbl.column("date").cast(pa.date32())
+            mask = None
+            if start is not None:
+                mask = pc.greater_equal(d, pa.scalar(pd.Timestamp(start).date(), pa.date32()))
+            if end is not None:
+                upper = pc.less_equal(d, pa.scalar(pd.Timestamp(end).date(), pa.date32()))
+                mask = upper if mask is None else pc.and_(mask, upper)
+            tbl = tbl.filter(mask)
+        tbl = tbl.select([c for c in wanted if c in tbl.column_names])
+    else:
+        raise ValueError(f"unsupported log file format: {getattr(source, 'name', source)}")
+    return arrow_to_log(tbl, table)
+
+def log_to_bytes(frame, table, fmt="parquet"):
+    # 다운로드 버튼용: 로그 프레임 → 파일 내용(bytes)
+    sink = pa.BufferOutputStream()
+    write_log(frame, table, sink, fmt)
+    return sink.getvalue().to_pybytes()
+
+FOOD_COLUMNS = ["food", "serving", "kcal", "carbs_g", "protein_g", "fat_g"]
+
+def foods_to_arrow(frame):
+    # 검증된 음식 DB(load_foods 결과) → Arrow 테이블. 서빙 그램 컬럼도 함께 저장한다.
+    columns = FOOD_COLUMNS + SERVING_COLUMNS + [c for c in frame.columns if c not in FOOD_COLUMNS + SERVING_COLUMNS]
+    return pa.Table.from_pandas(frame[columns], preserve_index=False)
+
+def write_foods(frame, dest, fmt="parquet"):
+    tbl = foods_to_arrow(frame)
+    if fmt == "parquet":
+        pq.write_table(tbl, dest, compression="zstd")
+    else:
+        with pa.ipc.new_file(dest, tbl.schema) as writer:
+            writer.write_table(tbl)
+
+def foods_to_bytes(frame, fmt="parquet"):
+    sink = pa.BufferOutputStream()
+    write_foods(frame, sink, fmt)
+    return sink.getvalue().to_pybytes()
+
+def read_foods(source, fmt=None):
+    # Parquet/Arrow 음식 DB 읽기 → load_foods와 같은 검증·정리를 거친 프레임.
+    # Arrow IPC 경로는 메모리 맵으로 연다.
+    fmt = fmt or file_format(getattr(source, "name", source))
+    if fmt == "parquet":
+        tbl = pq.read_table(source)
+    elif fmt == "arrow":
+        tbl = _open_arrow(source).read_all()
+    else:
+        raise ValueError(f"unsupported foods file format: {getattr(source, 'name', source)}")
+    return clean_foods(tbl.to_pandas().drop(columns=SERVING_COLUMNS, errors="ignore"))
@@ -0,0 +1,104 @@
+# 음식 DB 읽기·검증과 이름 → 영양성분 조회
+import re
+
+import numpy as np
+import pandas as pd
+
+from .search import FoodSearch
+
+SERVING_COLUMNS = ["serving_g"]
+
+def parse_servings(serving):
+    # 서빙 설명 → 1서빙 그램 수 (DB를 읽을 때 한 번만, 컬럼 단위로 처리)
+    #   "1공기(200g)" → 200 / "건식 40g" → 40 / "1/2개(150g)" → 150
+    # ml은 1g/ml로 본다. 그램을 찾지 못하면 serving_g는 NaN
+    text = serving.astype(str)
+    grams = pd.to_numeric(text.str.extract(r"(\d+(?:\.\d+)?)\s*(?:g|ml)", flags=re.I)[0], errors="coerce")
+    return pd.DataFrame({"serving_g": grams.where(grams > 0)}, index=serving.index)
+
+def load_foods(source):
+    # 음식 DB CSV(경로 또는 파일 객체)를 읽어 검증·정리
+    return clean_foods(pd.read_csv(source))
+
+def clean_foods(df):
+    # 음식 DB 검증·정리: 음식명 공백 제거, 수치 변환, 중복 이름은 첫 행만, 서빙 그램 컬럼 추가
+    needed = {"food","serving","kcal","carbs_g","protein_g","fat_g"}
+    if not needed.issubset(df.columns):
+        raise ValueError("foods CSV must have columns: " + ", ".join(needed))
+    df["food"] = df["food"].astype(str).str.strip()
+    for c in ["kcal","carbs_g","protein_g","fat_g"]:
+        df[c] = pd.to_numeric(df[c], errors="coerce").fillna(0.0)
+    df = df[df["food"] != ""].drop_duplicates("food", keep="first").reset_index(drop=True)
+    df[SERVING_COLUMNS] = parse_servings(df["serving"])
+    return df
+
+class FoodIndex:
+    # 음식명 → 영양 정보(kcal, 탄/단/지) 조회용 인덱스. 음식 DB 버전마다 한 번만 만든다.
+    NUTRIENTS = ["kcal", "carbs_g", "protein_g", "fat_g"]
+
+    def __init__(self, df_foods):
+        # 같은 이름이 여러 번 있으면 첫 행을 사용
+        foods = df_foods.drop_duplicates("food", keep="first")
+        self.names = pd.Index(foods["food"].astype(str).tolist())
+        self.values = foods[self.NUTRIENTS].to_numpy(dtype=float)
+        self.values.flags.writeable = False
+        self.table = pd.DataFrame(self.values, index=self.names, columns=self.NUTRIENTS)
+        self._pos = {name: i for i, name in enumerate(self.names)}
+        # 1서빙의 그램 수 (그램 정보가 없는 음식은 NaN). 그램 입력은 서빙 수로 바꿔 values로 계산한다
+        if "serving_g" in foods.columns:
+            self.grams = pd.to_numeric(foods["serving_g"], errors="coerce").to_numpy(dtype=float)
+        else:
+            self.grams = np.full(len(self.names), np.nan)
+        self.grams.flags.writeable = False
+
+    def __len__(self):
+        return len(self.names)
+
+    def __contains__(self, name):
+        return name in self._pos
+
+    def get(self, name):
+        # 단일 조회: {"kcal": ..., "carbs_g": ..., ...} 또는 None
+        i = self._pos.get(name)
+        if i is None:
+            return None
+        return dict(zip(self.NUTRIENTS, self.values[i].tolist()))
+
+    def kcal(self, name, servings=1.0):
+        i = self._pos.get(name)
+        if i is None:
+            return 0.0
+        return float(self.values[i, 0]) * float(servings)
+
+    def positions(self, names):
+        # 이름 배열 → DB 행 위치 배열 (없는 이름은 -1)
+        return self.names.get_indexer(pd.Index(np.asarray(names, dtype=object)))
+
+    def serving_grams(self, name):
+        i = self._pos.get(name)
+        return float(self.grams[i]) if i is not None else float("nan")
+
+    def servings_from_grams(self, names, grams):
+        # 그램 → 서빙 수 (그램 정보가 없거나 DB에 없는 음식은 NaN)
+        pos = self.positions(names)
+        per_serving = np.where(pos >= 0, self.grams[pos], np.nan)
+        return np.asarray(grams, dtype=float) / per_serving
+
+    def batch(self, names, servings=1.0):
+        # 이름/서빙 배열 → kcal, carbs_g, protein_g, fat_g 컬럼 (없는 음식은 0)
+        pos = self.positions(names)
+        servings = np.broadcast_to(np.asarray(servings, dtype=float), pos.shape)
+        out = np.zeros((len(pos), len(self.NUTRIENTS)))
+        hit = pos >= 0
+        out[hit] = self.values[pos[hit]] * servings[hit, None]
+        return pd.DataFrame(out, columns=self.NUTRIENTS)
+
+class FoodsDB:
+    # 검증된 음식 DB 한 벌 (내용 해시, 표, 조회 인덱스). 여러 세션이 읽기 전용으로 공유한다.
+    def __init__(self, digest, frame):
+        self.digest = digest
+        self.frame = frame
+        self.index = FoodIndex(frame)
+        self.search = FoodSearch(self.index.names)
+        # 서빙 그램 수를 읽지 못한 음식 (DB를 읽을 때 한 번 검사)
+        self.unparsed_servings = frame.loc[frame["serving_g"].isna(), ["food", "serving"]]
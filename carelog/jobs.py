@@ -0,0 +1,121 @@
+# 백그라운드 작업 (CSV 가져오기, 음식 DB 교체 등 오래 걸리는 계산)
+# 작업 함수 fn(job, *args)는 스레드 풀에서 돌며 job.report(진행률, 메시지)로 진행을 알리고,
+# 취소되면 report/check에서 JobCancelled가 나 멈춘다. 결과는 작업이 끝난 뒤 호출한 쪽이 한 번에 반영한다.
+# 같은 입력 키로 다시 요청하면 새로 돌리지 않고 진행 중이거나 끝난 작업에 붙는다 (세션끼리도 공유).
+# 결과를 반영한 쪽은 release로 알리고, 붙은 요청이 모두 가져가면 결과를 버린다 (큰 DataFrame을 계속 쥐고 있지 않게).
+import threading
+import time
+import uuid
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+class JobCancelled(Exception):
+    pass
+
+class Job:
+    # 상태: queued → running → done / failed / cancelled
+    def __init__(self, key, label):
+        self.id = uuid.uuid4().hex[:12]
+        self.key = key
+        self.label = label
+        self.status = "queued"
+        self.progress = 0.0
+        self.message = ""
+        self.result = None
+        self.error = None
+        self.attached = 0
+        self.created = time.time()
+        self.finished = None
+        self._cancel = threading.Event()
+        self._done = threading.Event()
+
+    @property
+    def done(self):
+        # True가 된 뒤에는 status·result·error가 더 바뀌지 않는다
+        return self._done.is_set()
+
+    @property
+    def cancelling(self):
+        return self._cancel.is_set()
+
+    def check(self):
+        if self._cancel.is_set():
+            raise JobCancelled(self.id)
+
+    def report(self, progress=None, message=None):
+        # 작업 함수용: 진행률(0~1)·메시지 갱신 겸 취소 확인
+        self.check()
+        if progress is not None:
+            self.progress = min(1.0, max(0.0, float(progress)))
+        if message is not None:
+            self.message = message
+
+    def wait(self, timeout=None):
+        return self._done.wait(timeout)
+
+class JobPool:
+    # 스레드 풀 위의 작업 목록 (결과가 DataFrame이라 같은 프로세스 안에서 세션 상태로 넘긴다).
+    # 끝난 작업은 붙은 요청이 모두 release할 때까지(최대 최근 keep개) 입력 키로 보관해, 같은 입력이 다시 오면 결과를 바로 돌려준다.
+    def __init__(self, max_workers=2, keep=16):
+        self.keep = keep
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="carelog-job")
+        self._lock = threading.Lock()
+        self._by_key = {}
+        self._finished = deque()
+
+    def submit(self, key, label, fn, *args, **kwargs):
+        # 같은 key의 작업이 진행 중이거나 끝나 있으면 그 작업에 붙는다 (취소 중인 작업에는 붙지 않음)
+        with self._lock:
+            job = self._by_key.get(key)
+            if job is None or job.cancelling:
+                job = Job(key, label)
+                self._by_key[key] = job
+                self._executor.submit(self._run, job, fn, args, kwargs)
+            job.attached += 1
+            return job
+
+    def _run(self, job, fn, args, kwargs):
+        status = "cancelled"
+        if not job.cancelling:
+            job.status = "running"
+            try:
+                job.result = fn(job, *args, **kwargs)
+                job.progress = 1.0
+                status = "done"
+            except JobCancelled:
+                pass
+            except Exception as e:  # 실패는 작업에 담아 요청한 쪽에서 보여 준다
+                job.error = e
+                status = "failed"
+        with self._lock:
+            job.status = status
+            job.finished = time.time()
+            if status == "cancelled":
+                self._forget(job)
+            else:
+                self._finished.append(job)
+                while len(self._finished) > self.keep:
+                    self._forget(self._finished.popleft())
+        job._done.set()
+
+    def _forget(self, job):
+        if self._by_key.get(job.key) is job:
+            del self._by_key[job.key]
+
+    def cancel(self, job):
+        # 붙어 있는 요청이 모두 취소해야 실제로 멈춘다 (다른 세션이 기다리는 작업은 계속 돈다)
+        with self._lock:
+            job.attached -= 1
+            if job.attached <= 0 and not job.done:
+                job._cancel.set()
+
+    def release(self, job):
+        # 결과를 반영한 뒤 호출: 붙어 있는 요청이 모두 가져가면 결과를 버리고 목록에서 뺀다
+        # (같은 입력이 다시 오면 새로 계산)
+        with self._lock:
+            job.attached -= 1
+            if job.attached <= 0 and job.done:
+                job.result = None
+                self._forget(job)
+                if job in self._finished:
+                    self._finished.remove(job)
@@ -0,0 +1,591 @@
+# 식단·운동·체중 로그: 스키마, 메모리 버퍼, SQLite 저장소, 변경 기록(되돌리기)
+import contextlib
+import sqlite3
+import threading
+
+import numpy as np
+import pandas as pd
+
+# 로그 스키마: 컬럼 → 저장 형식
+#   date: datetime64(날짜만), category: 범주형(음식 DB·끼니·활동 목록에 고정), float32: 수치, text: 문자열
+MEAL_TYPES = ["아침","점심","저녁","간식"]
+
+LOG_SCHEMAS = {
+    "meal_log": {"date": "date", "meal": "category", "food": "category", "servings": "float32",
+                 "kcal": "float32", "carbs_g": "float32", "protein_g": "float32", "fat_g": "float32"},
+    "exercise_log": {"date": "date", "activity": "category", "minutes": "float32", "weight_kg": "float32", "kcal_burned": "float32"},
+    "weight_log": {"date": "date", "weight_kg": "float32", "note": "text"},
+}
+
+# CSV 업로드: 고정 dtype으로 청크 단위 읽기 (파일에 없는 컬럼은 무시됨)
+MEAL_CSV_DTYPES = {"date": str, "meal": str, "food": str, "servings": "float32", "grams": "float32", "kcal": "float32"}
+EXERCISE_CSV_DTYPES = {"date": str, "activity": str, "minutes": "float32", "weight_kg": "float32", "kcal_burned": "float32"}
+WEIGHT_CSV_DTYPES = {"date": str, "weight_kg": "float32", "note": str}
+CSV_CHUNK_ROWS = 50_000
+
+def import_csv(source, log, dtypes, enrich=None, on_chunk=None, chunk_rows=CSV_CHUNK_ROWS):
+    # CSV를 청크 단위로 읽어 로그에 추가 (import_chunks 참고)
+    return import_chunks(pd.read_csv(source, dtype=dtypes, chunksize=chunk_rows), log, enrich, on_chunk)
+
+def import_chunks(chunks, log, enrich=None, on_chunk=None):
+    # 청크(DataFrame)마다 enrich(chunk) → (chunk, 보고서)로 계산한 뒤 로그에 추가.
+    # 반환: (건수, 청크 보고서를 합친 dict). 목록 값은 중복 없이 정렬해 합치고, dict 값은 이어서 합친다.
+    # on_chunk(누적 건수)는 청크마다 호출된다 (진행률 표시용).
+    total, merged = 0, {}
+    for chunk in chunks:
+        if enrich is not None:
+            chunk, report = enrich(chunk)
+            for name, value in report.items():
+                merged.setdefault(name, {} if isinstance(value, dict) else set()).update(value)
+        log.extend(chunk)
+        total += len(chunk)
+        if on_chunk is not None:
+            on_chunk(total)
+    return total, {name: value if isinstance(value, dict) else sorted(value) for name, value in merged.items()}
+
+class LogBuffer:
+    # 세션 로그(식단/운동/체중) 컨테이너.
+    # 행은 컬럼별 배열에 이어 쓰고(공간이 부족하면 2배로 확장), DataFrame은 읽을 때만 만든다.
+    # UI·CSV·저장소에서 들어오는 값은 모두 여기서 LOG_SCHEMAS 형식으로 변환된다.
+    # 각 행에는 증가하는 고유 ID가 붙고(프레임의 index), 수정·삭제는 이 ID로 한다.
+    # 저장소에 연결돼 있으면 새 ID는 저장소가 정하고(세션끼리 겹치지 않게), 변경은 저장소에 먼저 쓴 뒤 메모리에 반영한다.
+    # 삭제는 칸을 지운 표시(묘비)만 하고, 지운 칸이 살아 있는 행보다 많아지면 한 번에 당겨 채운다.
+    # 지운 칸의 값은 그대로 두므로 되돌리기로 복원할 때는 표시만 되살린다 (삭제·복원 비용이 로그 크기와 무관).
+    # (저장 dtype, 빈 칸 값) — 범주형은 코드(int32, -1=없음)로 저장
+    STORAGE = {
+        "date": ("datetime64[ns]", np.datetime64("NaT", "ns")),
+        "category": (np.int32, -1),
+        "float32": (np.float32, np.nan),
+        "text": (object, None),
+    }
+
+    def __init__(self, schema, categories=None, capacity=64):
+        self.schema = dict(schema)
+        self.columns = list(self.schema)
+        self._cats = {c: pd.Index([], dtype=object) for c, kind in self.schema.items() if kind == "category"}
+        for c, values in (categories or {}).items():
+            self.pin_categories(c, values)
+        self.version = 0
+        self.store = None
+        self.table = None
+        # 연결을 끊을 때의 (저장소 경로, 프레임): 다시 연결하면 이것과 비교해 그동안 바뀐 행만 저장소에 쓴다
+        self._synced = None
+        self._listeners = []
+        self._next_id = 1
+        self._alloc(capacity)
+
+    def _alloc(self, capacity):
+        self._data = {}
+        for c, kind in self.schema.items():
+            dtype, fill = self.STORAGE[kind]
+            self._data[c] = np.full(capacity, fill, dtype=dtype)
+        self._ids = np.zeros(capacity, dtype=np.int64)
+        # 칸별 사용 여부 (False = 지운 행). _n은 쓴 칸 수, _dead는 그중 지운 칸 수
+        self._alive = np.zeros(capacity, dtype=bool)
+        self._n = 0
+        self._dead = 0
+        self._frame = None
+        # 밖으로 내준 프레임과 메모리를 공유 중인 컬럼 (제자리 수정 전에 복사)
+        self._shared = set()
+        # 날짜 색인: (날짜순 날짜, 그 위치). 필요할 때 만들고, 행 추가 시에는 이어 붙여 유지한다
+        self._by_date = None
+
+    def pin_categories(self, column, values):
+        # 범주 목록에 없는 값을 뒤에 추가 (기존 코드는 그대로 유지)
+        cats = self._cats[column]
+        values = pd.Index(pd.unique(pd.Series(list(values), dtype=object).dropna()), dtype=object)
+        new = values[~values.isin(cats)]
+        if len(new):
+            self._cats[column] = cats.append(new)
+            self._frame = None
+
+    def blank(self):
+        # 같은 스키마·범주의 빈 로그 (백그라운드 가져오기에서 결과를 따로 모을 때)
+        return LogBuffer(self.schema, categories=self._cats)
+
+    def __len__(self):
+        return self._n - self._dead
+
+    @property
+    def empty(self):
+        return len(self) == 0
+
+    @property
+    def nbytes(self):
+        # 할당된 컬럼 배열 크기 (text 컬럼은 문자열 포인터만 셈)
+        return self._ids.nbytes + self._alive.nbytes + sum(arr.nbytes for arr in self._data.values())
+
+    def _reserve(self, extra):
+        cap = len(self._ids)
+        if self._n + extra <= cap:
+            return
+        while cap < self._n + extra:
+            cap *= 2
+        for c, arr in self._data.items():
+            grown = np.full(cap, self.STORAGE[self.schema[c]][1], dtype=arr.dtype)
+            grown[:self._n] = arr[:self._n]
+            self._data[c] = grown
+        ids = np.zeros(cap, dtype=np.int64)
+        ids[:self._n] = self._ids[:self._n]
+        self._ids = ids
+        alive = np.zeros(cap, dtype=bool)
+        alive[:self._n] = self._alive[:self._n]
+        self._alive = alive
+        self._shared = set()
+
+    def subscribe(self, fn):
+        # 변경 알림 등록: fn(removed, added) — 빠진 행/추가된 행 DataFrame (없으면 None)
+        self._listeners.append(fn)
+
+    def _sync(self, removed=None, added=None):
+        # 변경분을 알림과 같은 형태로 저장소에 먼저 쓴다. 실패하면 예외가 나고 메모리 로그는 그대로다.
+        if self.store is not None:
+            self.store.apply(self.table, removed, added)
+
+    def _new_ids(self, rows):
+        # 새 행 ID: 저장소에 연결돼 있으면 저장소가 행을 기록하면서 정한 ID, 아니면 세션 안에서 이어지는 ID
+        if self.store is not None:
+            return self.store.insert(self.table, rows, min_id=self._next_id)
+        return np.arange(self._next_id, self._next_id + len(rows), dtype=np.int64)
+
+    def _changed(self, removed=None, added=None):
+        self._frame = None
+        self.version += 1
+        for fn in self._listeners:
+            fn(removed, added)
+
+    def attach(self, store, table):
+        # 저장소 연결: 연결 전에 쌓인 행은 저장소로 옮기고, 저장소 전체를 한 번 읽어 온다 (새 행 ID는 저장소가 붙임).
+        # 같은 저장소에 다시 연결하면 끊을 때와 비교해 그동안 추가·수정·삭제한 행만 반영한다
+        # (다른 세션이 그 사이 쓴 행은 지우지 않는다). 다른 저장소를 쓰다 옮겨 오면 아무것도 옮기지 않는다.
+        self.detach()
+        if self._synced is None:
+            base = self.frame.iloc[:0]
+        elif self._synced[0] == store.path:
+            base = self._synced[1]
+        else:
+            base = self.frame
+        cur = self.frame
+        common = cur.index.intersection(base.index)
+        a, b = cur.loc[common].astype(object), base.loc[common].astype(object)
+        changed = common[~((a == b) | (a.isna() & b.isna())).all(axis=1).to_numpy()]
+        store.merge(table, base.index.difference(cur.index), cur.loc[changed], cur.loc[cur.index.difference(base.index)],
+                    min_id=self._next_id)
+        self.store, self.table = store, table
+        old = self.frame
+        loaded = store.load(table)
+        self._alloc(max(64, len(loaded)))
+        self._write(loaded, loaded.index.to_numpy(dtype=np.int64))
+        self._n = len(loaded)
+        self._next_id = max(self._next_id, int(loaded.index.max()) + 1 if len(loaded) else 1)
+        self._changed(old, self.frame)
+
+    def detach(self):
+        if self.store is not None:
+            self._synced = (self.store.path, self.frame)
+        self.store = self.table = None
+
+    def append(self, row):
+        self.extend(pd.DataFrame([row]))
+
+    def extend(self, rows):
+        # 여러 행을 한 번에 추가 (프리셋, CSV 업로드 등). dict 목록 또는 DataFrame
+        if not isinstance(rows, pd.DataFrame):
+            rows = pd.DataFrame(list(rows))
+        k = len(rows)
+        if k == 0:
+            return
+        self._reserve(k)
+        # 끝(_n) 뒤 빈 공간에 먼저 변환해 쓰고(_n은 그대로라 아직 보이지 않음), 저장소 기록이 끝나면 ID를 붙여 늘린다
+        self._write(rows, 0)
+        ids = self._new_ids(self._view(np.arange(self._n, self._n + k)) if self.store is not None else rows)
+        self._ids[self._n:self._n + k] = ids
+        added = self._view(slice(self._n, self._n + k))
+        self._n += k
+        self._next_id = int(ids[-1]) + 1
+        self._index_dates(np.arange(self._n - k, self._n))
+        self._changed(None, added)
+
+    def _index_dates(self, pos):
+        # 새로 쓴 위치들을 날짜 색인에 넣는다 (모두 마지막 날짜 이후면 이어 붙이기만)
+        if self._by_date is None:
+            return
+        keys, order = self._by_date
+        d = self._data["date"][pos]
+        sort = np.argsort(d, kind="stable")
+        pos, d = pos[sort], d[sort]
+        if len(keys) == 0 or d[0] >= keys[-1]:
+            self._by_date = (np.concatenate([keys, d]), np.concatenate([order, pos]))
+        else:
+            at = np.searchsorted(keys, d, side="right")
+            self._by_date = (np.insert(keys, at, d), np.insert(order, at, pos))
+
+    def _date_index(self):
+        # 지운 칸도 들어 있다 (찾은 뒤 걸러 냄)
+        if self._by_date is None:
+            d = self._data["date"][:self._n]
+            order = np.argsort(d, kind="stable")
+            self._by_date = (d[order], order)
+        return self._by_date
+
+    def _encode(self, column, values):
+        kind = self.schema[column]
+        if kind == "date":
+            return pd.to_datetime(values, errors="coerce", format="mixed").dt.normalize().to_numpy(dtype="datetime64[ns]")
+        if kind == "category":
+            values = values.astype(object)
+            codes = self._cats[column].get_indexer(values)
+            if (codes < 0).any():
+                self.pin_categories(column, values[codes < 0])
+                codes = self._cats[column].get_indexer(values)
+            return codes.astype(np.int32)
+        if kind == "float32":
+            return pd.to_numeric(values, errors="coerce").to_numpy(dtype=np.float32)
+        return values.to_numpy(dtype=object)
+
+    def _write(self, rows, ids):
+        # 현재 끝(_n) 뒤에 rows를 변환해 쓴다. _n은 호출한 쪽에서 늘린다.
+        k = len(rows)
+        for c in self.columns:
+            if c in rows.columns:
+                self._data[c][self._n:self._n + k] = self._encode(c, rows[c].reset_index(drop=True))
+        self._ids[self._n:self._n + k] = ids
+        self._alive[self._n:self._n + k] = True
+
+    def _decode(self, column, values):
+        # 저장 배열 값 → 프레임 컬럼 (범주형은 코드 → Categorical)
+        if self.schema[column] == "category":
+            return pd.Categorical.from_codes(values, dtype=pd.CategoricalDtype(self._cats[column]))
+        return values
+
+    def _view(self, rows):
+        # rows(slice 또는 위치 배열)에 해당하는 행을 DataFrame으로 (index = 행 ID)
+        cols = {c: self._decode(c, self._data[c][rows]) for c in self.schema}
+        if isinstance(rows, slice):
+            self._shared.update(self.columns)
+        return pd.DataFrame(cols, index=pd.Index(self._ids[rows], name="id"), copy=False)
+
+    def _live(self):
+        # 살아 있는 칸: 지운 칸이 없으면 slice(배열을 복사 없이 공유), 있으면 위치 배열
+        return slice(0, self._n) if self._dead == 0 else np.flatnonzero(self._alive[:self._n])
+
+    @property
+    def frame(self):
+        if self._frame is None:
+            self._frame = self._view(self._live())
+        return self._frame
+
+    @property
+    def ids(self):
+        return self._ids[self._live()]
+
+    def positions(self, ids):
+        # 행 ID → 현재 위치 (ID는 위치 순서대로 증가). 없거나 지운 ID는 제외
+        ids = np.asarray(ids, dtype=np.int64)
+        pos = np.searchsorted(self._ids[:self._n], ids)
+        pos = pos[pos < self._n]
+        pos = pos[np.isin(self._ids[pos], ids)]
+        return pos[self._alive[pos]]
+
+    def take(self, ids):
+        # 주어진 ID의 행만 만들어 반환 (전체 프레임을 만들지 않음)
+        return self._view(self.positions(ids))
+
+    def ids_between(self, start, end):
+        # 날짜 구간 [start, end]에 속한 행 ID (ID 순). 날짜 색인에서 이분 탐색
+        keys, order = self._date_index()
+        lo = np.searchsorted(keys, np.datetime64(pd.Timestamp(start), "ns"), side="left")
+        hi = np.searchsorted(keys, np.datetime64(pd.Timestamp(end), "ns"), side="right")
+        pos = order[lo:hi]
+        return self._ids[np.sort(pos[self._alive[pos]])]
+
+    def update(self, ids, changes):
+        # 일부 행의 일부 컬럼만 수정. changes: index=행 ID, 컬럼=바꿀 컬럼
+        pos = self.positions(ids)
+        if len(pos) == 0:
+            return
+        changes = changes.loc[self._ids[pos]]
+        removed = self._view(pos)
+        encoded = {c: self._encode(c, changes[c].reset_index(drop=True)) for c in changes.columns if c in self.schema}
+        added = removed.copy()
+        for c, values in encoded.items():
+            added[c] = self._decode(c, values)
+        self._sync(removed, added)
+        for c, values in encoded.items():
+            if c in self._shared:
+                self._data[c] = self._data[c].copy()
+                self._shared.discard(c)
+            self._data[c][pos] = values
+        if "date" in encoded:
+            self._by_date = None
+        self._changed(removed, self._view(pos))
+
+    def delete(self, ids):
+        # 행 ID 목록으로 삭제 (칸에 지운 표시만). 알림에는 삭제된 행만 넘긴다.
+        pos = self.positions(ids)
+        if len(pos) == 0:
+            return
+        removed = self._view(pos)
+        self._sync(removed, None)
+        self._alive[pos] = False
+        self._dead += len(pos)
+        if self._dead > max(64, self._n // 2):
+            self._compact()
+        self._changed(removed, None)
+
+    def _compact(self):
+        # 지운 칸을 빼고 당겨 채운다 (새 배열에 쓰므로 밖으로 내준 프레임은 그대로). 날짜 색인은 위치만 고친다.
+        keep = self._alive[:self._n]
+        n = int(keep.sum())
+        old_data, old_ids, by_date = self._data, self._ids[:self._n], self._by_date
+        self._alloc(max(64, n))
+        for c in self.columns:
+            self._data[c][:n] = old_data[c][:len(keep)][keep]
+        self._ids[:n] = old_ids[keep]
+        self._alive[:n] = True
+        self._n = n
+        if by_date is not None:
+            keys, order = by_date
+            live = keep[order]
+            self._by_date = (keys[live], (np.cumsum(keep) - 1)[order[live]])
+
+    def restore(self, rows):
+        # 되돌리기용: 삭제됐던 행을 원래 행 ID 그대로 되살린다.
+        # 지운 칸이 아직 남아 있으면 표시만 되살리고, 모든 ID보다 크면 끝에 붙인다.
+        # 그 밖(정리로 칸이 없어진 행)만 ID 순서 위치에 끼워 넣는다.
+        if rows is None or len(rows) == 0:
+            return
+        rows = rows.sort_index()
+        self._sync(None, rows)
+        ids = rows.index.to_numpy(dtype=np.int64)
+        pos = np.searchsorted(self._ids[:self._n], ids)
+        hit = pos < self._n
+        hit[hit] = (self._ids[pos[hit]] == ids[hit]) & ~self._alive[pos[hit]]
+        self._alive[pos[hit]] = True
+        self._dead -= int(hit.sum())
+        rest = rows[~hit]
+        if len(rest):
+            rest_ids = ids[~hit]
+            if self._n == 0 or rest_ids[0] > self._ids[self._n - 1]:
+                self._reserve(len(rest))
+                self._write(rest, rest_ids)
+                self._n += len(rest)
+                self._index_dates(np.arange(self._n - len(rest), self._n))
+            else:
+                self._insert(rest, rest_ids)
+        self._next_id = max(self._next_id, int(ids[-1]) + 1)
+        self._changed(None, self.take(ids))
+
+    def _insert(self, rows, ids):
+        # ID 순서 위치에 행 끼워 넣기 (전체 배열을 새로 씀)
+        at = np.searchsorted(self._ids[:self._n], ids)
+        old_data, old_ids, old_alive, n, dead = self._data, self._ids, self._alive, self._n, self._dead
+        m = n + len(rows)
+        self._alloc(max(64, m))
+        for c in self.columns:
+            self._data[c][:m] = np.insert(old_data[c][:n], at, self._encode(c, rows[c].reset_index(drop=True)))
+        self._ids[:m] = np.insert(old_ids[:n], at, ids)
+        self._alive[:m] = np.insert(old_alive[:n], at, True)
+        self._n, self._dead = m, dead
+
+class SqliteLogStore:
+    # 로컬 SQLite 파일 저장소 (선택). 날짜·끼니/활동 인덱스를 둔다.
+    # 새 행 ID(rowid)는 log_ids 테이블의 표별 카운터에서 기록과 같은 트랜잭션 안에서 받는다.
+    # 같은 파일을 쓰는 세션·프로세스끼리 ID가 겹치지 않고, 지운 행의 ID도 다시 쓰지 않는다 (되돌리기로 복원 가능).
+    INDEXES = {"meal_log": ["date", "meal"], "exercise_log": ["date", "activity"], "weight_log": ["date"]}
+
+    def __init__(self, path):
+        self.path = path
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.lock = threading.Lock()
+        with self.lock, self.conn:
+            for table, index_cols in self.INDEXES.items():
+                cols = ", ".join(f"{c} {'REAL' if kind == 'float32' else 'TEXT'}" for c, kind in LOG_SCHEMAS[table].items())
+                self.conn.execute(f"CREATE TABLE IF NOT EXISTS {table} ({cols})")
+                self.conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{table}_{'_'.join(index_cols)} ON {table} ({', '.join(index_cols)})")
+            self.conn.execute("CREATE TABLE IF NOT EXISTS log_ids (name TEXT PRIMARY KEY, next_id INTEGER NOT NULL)")
+
+    @contextlib.contextmanager
+    def _transaction(self):
+        # 쓰기 잠금을 처음부터 잡는 트랜잭션 (ID 읽기와 기록 사이에 다른 연결이 끼어들지 않게). 예외가 나면 되돌린다.
+        with self.lock, self.conn:
+            self.conn.execute("BEGIN IMMEDIATE")
+            yield
+
+    def _take_ids(self, table, n, min_id=1):
+        # 트랜잭션 안에서 호출: 새 행 ID n개를 받아 카운터를 넘긴다
+        row = self.conn.execute("SELECT next_id FROM log_ids WHERE name = ?", (table,)).fetchone()
+        top = self.conn.execute(f"SELECT MAX(rowid) FROM {table}").fetchone()[0] or 0
+        start = max(row[0] if row else 1, top + 1, int(min_id))
+        self.conn.execute("INSERT OR REPLACE INTO log_ids (name, next_id) VALUES (?, ?)", (table, start + n))
+        return np.arange(start, start + n, dtype=np.int64)
+
+    def _records(self, table, frame):
+        # 로그 스키마 프레임 → SQLite 값 (날짜는 YYYY-MM-DD 문자열)
+        out = {}
+        for c, kind in LOG_SCHEMAS[table].items():
+            if kind == "date":
+                out[c] = frame[c].dt.strftime("%Y-%m-%d")
+            elif kind == "float32":
+                out[c] = frame[c].astype(float)
+            else:
+                out[c] = frame[c].astype(object)
+        out = pd.DataFrame(out).astype(object)
+        out = out.where(out.notna(), None)
+        out.insert(0, "rowid", frame.index.to_numpy(dtype=np.int64).tolist())
+        return out.itertuples(index=False, name=None)
+
+    def _insert_sql(self, table):
+        # 로그의 행 ID를 SQLite rowid로 사용
+        columns = ["rowid"] + list(LOG_SCHEMAS[table])
+        return f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})"
+
+    def _update(self, table, frame):
+        # 트랜잭션 안에서 호출: 행 ID(rowid)가 같은 행의 모든 컬럼을 frame 값으로
+        columns = list(LOG_SCHEMAS[table])
+        sql = f"UPDATE {table} SET {', '.join(f'{c} = ?' for c in columns)} WHERE rowid = ?"
+        self.conn.executemany(sql, [r[1:] + r[:1] for r in self._records(table, frame)])
+
+    def insert(self, table, frame, min_id=1):
+        # 새 행을 한 번의 트랜잭션으로 기록하고 붙인 행 ID를 반환 (frame의 index는 쓰지 않음).
+        # min_id: 호출한 로그가 이미 쓴 ID보다 크게 받기 위한 하한
+        with self._transaction():
+            ids = self._take_ids(table, len(frame), min_id)
+            self.conn.executemany(self._insert_sql(table), self._records(table, frame.set_axis(ids)))
+        return ids
+
+    def apply(self, table, removed, added):
+        # 로그 변경분(빠진 행/추가된 행)을 한 트랜잭션으로 반영. 같은 ID끼리면 UPDATE
+        # (추가된 행은 이미 ID가 있는 행: 되돌리기로 복원한 행 등)
+        with self._transaction():
+            if removed is not None and added is not None and removed.index.equals(added.index):
+                self._update(table, added)
+                return
+            if removed is not None:
+                self.conn.executemany(f"DELETE FROM {table} WHERE rowid = ?", [(int(i),) for i in removed.index])
+            if added is not None:
+                self.conn.executemany(self._insert_sql(table), self._records(table, added))
+
+    def merge(self, table, deleted_ids, updated, new, min_id=1):
+        # 연결을 끊은 동안의 변경을 한 트랜잭션으로 반영: 행 ID로 삭제·수정하고, 새 행은 ID를 받아 추가
+        with self._transaction():
+            self.conn.executemany(f"DELETE FROM {table} WHERE rowid = ?", [(int(i),) for i in deleted_ids])
+            self._update(table, updated)
+            ids = self._take_ids(table, len(new), min_id)
+            self.conn.executemany(self._insert_sql(table), self._records(table, new.set_axis(ids)))
+        return ids
+
+    def load(self, table):
+        columns = list(LOG_SCHEMAS[table])
+        with self.lock:
+            return pd.read_sql_query(f"SELECT rowid AS id, {', '.join(columns)} FROM {table} ORDER BY rowid", self.conn, index_col="id")
+
+class OpJournal:
+    # 로그 변경 기록 (추가·삭제·수정·CSV 업로드). 항목 하나 = 사용자 동작 하나.
+    # 각 동작은 로그 변경 알림(빠진 행/추가된 행)을 그대로 모아 둔 것이라
+    # 되돌리기/다시 실행은 그 행들만 반대로 적용한다 (로그 크기와 무관).
+    # checkpoint_every 항목마다 기록 위치를 표시하고, keep_checkpoints개보다 오래된 표시 이전 항목은 버린다
+    # (되돌리기 가능한 범위를 정하는 표시일 뿐, 로그 상태는 LogBuffer가 들고 있다).
+    LABELS = {"meal_log": "식단", "exercise_log": "운동", "weight_log": "체중"}
+
+    def __init__(self, logs, checkpoint_every=50, keep_checkpoints=4):
+        self.logs = dict(logs)
+        self.checkpoint_every = checkpoint_every
+        self.keep_checkpoints = keep_checkpoints
+        self._replaying = False
+        self._group = None
+        for key, log in self.logs.items():
+            log.subscribe(self._listener(key))
+        self.reset()
+
+    def reset(self):
+        # 현재 로그 상태를 시작점으로 기록을 비운다 (저장소 연결 등 전체 교체 후)
+        self.entries = []
+        self.cursor = 0
+        self._start = 0
+        self.checkpoints = []
+        self.checkpoint()
+
+    def _listener(self, key):
+        def record(removed, added):
+            if self._replaying:
+                return
+            op = (key, removed, added)
+            if self._group is not None:
+                self._group["ops"].append(op)
+            else:
+                kind = "수정" if removed is not None and added is not None else ("삭제" if added is None else "추가")
+                self._commit({"label": f"{self.LABELS.get(key, key)} {kind}", "ops": [op]})
+        return record
+
+    @contextlib.contextmanager
+    def group(self, label, **meta):
+        # 여러 변경을 한 동작으로 묶는다 (표 편집 저장, CSV 업로드 등)
+        if self._group is not None:
+            yield
+            return
+        self._group = {"label": label, "ops": [], **meta}
+        try:
+            yield
+        finally:
+            entry, self._group = self._group, None
+            if entry["ops"]:
+                self._commit(entry)
+
+    def _commit(self, entry):
+        # 되돌린 뒤 새 동작이 들어오면 다시 실행할 항목과 그 뒤 표시는 버린다.
+        del self.entries[self.cursor - self._start:]
+        self.checkpoints = [cp for cp in self.checkpoints if cp <= self.cursor]
+        self.entries.append(entry)
+        self.cursor += 1
+        if self.cursor - self.checkpoints[-1] >= self.checkpoint_every:
+            self.checkpoint()
+
+    def checkpoint(self):
+        # 현재 기록 위치 표시. 표시가 많아지면 가장 오래된 표시 이전 항목을 버린다
+        self.checkpoints.append(self.cursor)
+        if len(self.checkpoints) > self.keep_checkpoints:
+            self.checkpoints = self.checkpoints[-self.keep_checkpoints:]
+            drop = self.checkpoints[0] - self._start
+            del self.entries[:drop]
+            self._start += drop
+
+    def can_undo(self):
+        return self.cursor > self._start
+
+    def can_redo(self):
+        return self.cursor < self._start + len(self.entries)
+
+    def _apply(self, ops, undo):
+        self._replaying = True
+        try:
+            for key, removed, added in (reversed(ops) if undo else ops):
+                if undo:
+                    removed, added = added, removed
+                log = self.logs[key]
+                if removed is not None and added is not None and removed.index.equals(added.index):
+                    log.update(added.index, added)
+                    continue
+                if removed is not None:
+                    log.delete(removed.index)
+                if added is not None:
+                    log.restore(added)
+        finally:
+            self._replaying = False
+
+    def undo(self):
+        # 마지막 동작을 되돌리고 그 항목을 반환
+        if not self.can_undo():
+            return None
+        self.cursor -= 1
+        entry = self.entries[self.cursor - self._start]
+        self._apply(entry["ops"], undo=True)
+        return entry
+
+    def redo(self):
+        if not self.can_redo():
+            return None
+        entry = self.entries[self.cursor - self._start]
+        self._apply(entry["ops"], undo=False)
+        self.cursor += 1
+        return entry
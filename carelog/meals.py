@@ -0,0 +1,97 @@
+# 식단 행 만들기와 kcal·탄단지 계산 (음식 DB 기준)
+import numpy as np
+import pandas as pd
+
+from .foods import FoodIndex
+
+def kcal_from_food(food_index, name, servings=1.0):
+    return food_index.kcal(name, servings)
+
+def meal_row(food_index, day, meal, food, servings):
+    nut = food_index.get(food) or dict.fromkeys(FoodIndex.NUTRIENTS, 0.0)
+    row = {"date": day, "meal": meal, "food": food, "servings": servings}
+    row.update({k: v * float(servings) for k, v in nut.items()})
+    return row
+
+def enrich_meals(meal_df, food_index):
+    # 식단 로그 전체를 음식 DB와 한 번에 merge → kcal/탄/단/지 = DB 값 × servings
+    # 반환값: (계산된 DataFrame, DB에 없는 음식명 목록). 없는 음식은 0으로 채운다.
+    # grams 컬럼이 있으면 서빙 수가 빈 행은 그램 ÷ 1서빙 그램으로 채운다 (1서빙 그램을 모르는 음식은 서빙 수를 비워 두고 0으로 계산).
+    base = meal_df.drop(columns=[c for c in FoodIndex.NUTRIENTS if c in meal_df.columns])
+    if "grams" in base.columns:
+        from_grams = food_index.servings_from_grams(base["food"], pd.to_numeric(base["grams"], errors="coerce"))
+        if "servings" in base.columns:
+            base["servings"] = pd.to_numeric(base["servings"], errors="coerce").fillna(pd.Series(from_grams, index=base.index))
+        else:
+            base["servings"] = from_grams
+        base = base.drop(columns=["grams"])
+    if "servings" not in base.columns:
+        base["servings"] = 1.0
+    merged = base.merge(food_index.table, how="left", left_on="food", right_index=True, sort=False)
+    unmatched = merged.loc[merged["kcal"].isna(), "food"].dropna().astype(str).unique().tolist()
+    servings = pd.to_numeric(merged["servings"], errors="coerce").to_numpy(dtype=float)
+    nutrients = merged[FoodIndex.NUTRIENTS].to_numpy(dtype=float)
+    merged[FoodIndex.NUTRIENTS] = np.nan_to_num(nutrients * servings[:, None], nan=0.0)
+    return merged.reset_index(drop=True), unmatched
+
+def enrich_meal_upload(chunk, food_index, search=None):
+    # 업로드 청크의 kcal·탄단지 계산. CSV에 kcal 값이 있으면 그 값을 우선 사용
+    # search가 있으면 DB에 없는 음식명을 가장 가까운 DB 음식명으로 먼저 보정한다.
+    resolved = {}
+    if search is not None:
+        missing = chunk.loc[~chunk["food"].isin(food_index.names), "food"].dropna().unique()
+        resolved = {name: match for name in missing if (match := search.resolve(name)) is not None}
+        if resolved:
+            # Parquet/Arrow 로그의 food는 범주형이라 새 이름을 넣을 수 없으므로 문자열로 바꿔 보정한다
+            chunk["food"] = chunk["food"].astype(object).replace(resolved)
+    given_kcal = chunk["kcal"].to_numpy() if "kcal" in chunk.columns else None
+    no_grams = _grams_without_serving(chunk, food_index)
+    chunk, unmatched = enrich_meals(chunk, food_index)
+    if given_kcal is not None:
+        chunk["kcal"] = np.where(np.isnan(given_kcal), chunk["kcal"].to_numpy(), given_kcal)
+    return chunk, {"unmatched": unmatched, "resolved": resolved, "no_grams": no_grams}
+
+def _grams_without_serving(meal_df, food_index):
+    # 서빙 수 없이 그램만 적었는데 DB에 1서빙 그램이 없어(예: "1개") 서빙 수를 계산할 수 없는 음식명 목록
+    if "grams" not in meal_df.columns:
+        return []
+    grams = pd.to_numeric(meal_df["grams"], errors="coerce")
+    need = grams.notna() & meal_df["food"].isin(food_index.names)
+    if "servings" in meal_df.columns:
+        need &= pd.to_numeric(meal_df["servings"], errors="coerce").isna()
+    need &= np.isnan(food_index.servings_from_grams(meal_df["food"], grams))
+    return meal_df.loc[need, "food"].astype(str).unique().tolist()
+
+def apply_meal_edits(log, view, edits, food_index):
+    # data_editor 변경분(edited/added/deleted_rows)만 로그에 반영. view는 편집기에 보여 준 행(index = 행 ID).
+    # 음식·서빙이 바뀐 행만 영양성분을 다시 계산한다. 반환값: (수정, 추가, 삭제 건수, DB에 없는 음식명)
+    ids = view.index.to_numpy()
+    deleted = {int(ids[i]) for i in edits.get("deleted_rows", [])}
+    changed = {}
+    for i, change in edits.get("edited_rows", {}).items():
+        row_id = int(ids[int(i)])
+        if change.get("삭제"):
+            deleted.add(row_id)
+        change = {c: v for c, v in change.items() if c in log.schema}
+        if change and row_id not in deleted:
+            changed[row_id] = change
+    unmatched = []
+    if changed:
+        upd = view.loc[list(changed), log.columns].astype(object)
+        for row_id, change in changed.items():
+            for c, v in change.items():
+                upd.at[row_id, c] = v
+        recalc = [row_id for row_id, change in changed.items() if "food" in change or "servings" in change]
+        if recalc:
+            rows = upd.loc[recalc]
+            upd.loc[recalc, FoodIndex.NUTRIENTS] = food_index.batch(rows["food"], pd.to_numeric(rows["servings"], errors="coerce")).to_numpy()
+            unmatched = [f for f in rows["food"].dropna().astype(str).unique() if f not in food_index]
+        log.update(upd.index, upd)
+    added = pd.DataFrame([r for r in edits.get("added_rows", []) if r.get("food")])
+    if len(added):
+        added = added.drop(columns=[c for c in added.columns if c not in log.schema])
+        added, missing = enrich_meals(added, food_index)
+        unmatched += [f for f in missing if f not in unmatched]
+        log.extend(added)
+    log.delete(sorted(deleted))
+    return len(changed), len(added), len(deleted), unmatched
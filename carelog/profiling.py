@@ -0,0 +1,101 @@
+# 실행(rerun)별 구간 시간·메모리 측정 (앱 디버그 패널용, Streamlit 없이 사용 가능)
+# 꺼져 있으면 section()은 아무것도 하지 않는 공용 컨텍스트를 돌려주므로 비용이 거의 없다.
+#   prof.begin("전체", sample=fn)   # 실행 시작 (fn: 실행 끝에 찍을 크기 정보 dict)
+#   with prof.section("식단 탭"): ...
+#   record = prof.end()            # 실행 기록 (history에도 보관, log_path가 있으면 JSONL로 추가)
+# begin 없이 section이 열리면(fragment만 다시 실행된 경우) 그 구간을 하나의 실행으로 기록한다.
+import functools
+import json
+import os
+import time
+from collections import deque
+from contextlib import contextmanager, nullcontext
+from datetime import datetime
+
+_OFF = nullcontext()
+
+def rss_bytes():
+    # 현재 프로세스 RSS(bytes). Linux는 /proc, 그 밖의 Unix는 최대 RSS, 알 수 없으면 None
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if os.uname().sysname == "Darwin" else peak * 1024
+
+class RerunProfiler:
+    def __init__(self, enabled=False, history=50, log_path=None):
+        self.enabled = enabled
+        self.log_path = log_path
+        self.history = deque(maxlen=history)
+        self._run = None
+        self._depth = 0
+        self._sample = None
+
+    def begin(self, kind, sample=None):
+        # 새 실행 시작. 끝나지 않은 이전 실행(st.stop·st.rerun 등으로 중단)은 미완료로 남긴다.
+        if not self.enabled:
+            return
+        if self._run is not None:
+            self._finish(complete=False)
+        self._sample = sample
+        self._run = self._new(kind)
+
+    def _new(self, kind):
+        return {"time": datetime.now().isoformat(timespec="milliseconds"), "kind": kind, "sections": [],
+                "_start": time.perf_counter()}
+
+    def section(self, name):
+        return self._section(name) if self.enabled else _OFF
+
+    @contextmanager
+    def _section(self, name):
+        implicit = self._run is None
+        if implicit:
+            self._run = self._new("부분")
+        self._depth += 1
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._depth -= 1
+            if self._run is not None:
+                self._run["sections"].append({"name": name, "depth": self._depth, "ms": (time.perf_counter() - start) * 1e3})
+            if implicit and self._depth == 0:
+                self._finish()
+
+    def timed(self, name):
+        # 함수 전체를 한 구간으로 측정하는 데코레이터 (fragment만 다시 실행될 때도 측정된다)
+        def wrap(fn):
+            @functools.wraps(fn)
+            def run(*args, **kwargs):
+                with self.section(name):
+                    return fn(*args, **kwargs)
+            return run
+        return wrap
+
+    def end(self):
+        if not self.enabled or self._run is None:
+            return None
+        return self._finish()
+
+    def _finish(self, complete=True):
+        run, self._run, self._depth = self._run, None, 0
+        run["total_ms"] = (time.perf_counter() - run.pop("_start")) * 1e3
+        run["complete"] = complete
+        if self._sample is not None:
+            try:
+                run["sizes"] = self._sample()
+            except Exception as e:  # 측정 때문에 앱이 멈추지 않도록
+                run["sizes"] = {"error": repr(e)}
+        run["rss_mb"] = None if (rss := rss_bytes()) is None else rss / 2**20
+        self.history.append(run)
+        if self.log_path:
+            with open(self.log_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(run, ensure_ascii=False, default=str) + "\n")
+        return run
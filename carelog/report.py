@@ -0,0 +1,77 @@
+# 사용자별 요약 리포트 (Streamlit 없이): 로그 CSV 읽기 → 열량 계산 → 날짜별 합계
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from .activities import enrich_exercise_upload
+from .logs import EXERCISE_CSV_DTYPES, LOG_SCHEMAS, MEAL_CSV_DTYPES, MEAL_TYPES, WEIGHT_CSV_DTYPES, LogBuffer, import_chunks, import_csv
+from .meals import enrich_meal_upload
+from .rollup import DailyRollup, WeightTimeline
+
+# 사용자 폴더 안의 로그 파일 (파일명에 meal/exercise/weight가 들어간 CSV·Parquet·Arrow 파일 전부)
+LOG_PATTERNS = {"weight_log": "*weight*", "meal_log": "*meal*", "exercise_log": "*exercise*"}
+LOG_SUFFIXES = {".csv", ".parquet", ".pq", ".arrow", ".feather", ".ipc"}
+
+def user_logs(user_dir, foods, catalog):
+    # 사용자 폴더의 CSV를 읽어 로그 3종과 날짜별 합계를 만든다.
+    # 체중을 먼저 읽어 운동 열량 계산에 날짜별 체중을 쓴다. 반환: (logs, rollup, weights, 보고서)
+    user_dir = Path(user_dir)
+    logs = {
+        "meal_log": LogBuffer(LOG_SCHEMAS["meal_log"], categories={"meal": MEAL_TYPES, "food": foods.index.names}),
+        "exercise_log": LogBuffer(LOG_SCHEMAS["exercise_log"], categories={"activity": catalog.names}),
+        "weight_log": LogBuffer(LOG_SCHEMAS["weight_log"]),
+    }
+    rollup = DailyRollup()
+    logs["meal_log"].subscribe(rollup.listener("meal"))
+    logs["exercise_log"].subscribe(rollup.listener("exercise"))
+    weights = WeightTimeline(logs["weight_log"])
+    readers = {
+        "weight_log": (WEIGHT_CSV_DTYPES, None),
+        "meal_log": (MEAL_CSV_DTYPES, lambda c: enrich_meal_upload(c, foods.index, foods.search)),
+        "exercise_log": (EXERCISE_CSV_DTYPES, lambda c: enrich_exercise_upload(c, catalog, weights)),
+    }
+    report = {}
+    for key, pattern in LOG_PATTERNS.items():
+        dtypes, enrich = readers[key]
+        for path in sorted(p for p in user_dir.glob(pattern) if p.suffix.lower() in LOG_SUFFIXES):
+            if path.suffix.lower() == ".csv":
+                _, file_report = import_csv(path, logs[key], dtypes, enrich)
+            else:
+                from . import columnar  # pyarrow는 Parquet/Arrow 파일이 있을 때만 필요
+                _, file_report = import_chunks([columnar.read_log(path, key)], logs[key], enrich)
+            for name, value in file_report.items():
+                if isinstance(value, dict):
+                    report.setdefault(name, {}).update(value)
+                else:
+                    report[name] = sorted(set(report.get(name, [])) | set(value))
+    return logs, rollup, weights, report
+
+def summarize(user, logs, rollup, weights, report):
+    # 리포트 한 줄: 기록 기간, 일평균 섭취·소모 열량, 운동 시간, 체중 변화
+    daily = rollup.frame()
+    weights = weights.frame()
+    row = {
+        "user": user,
+        "first_date": daily.index.min() if len(daily) else pd.NaT,
+        "last_date": daily.index.max() if len(daily) else pd.NaT,
+        "days": len(daily),
+        "meals": len(logs["meal_log"]),
+        "exercises": len(logs["exercise_log"]),
+        "avg_kcal_in": daily["kcal_in"].mean() if len(daily) else np.nan,
+        "avg_kcal_out": daily["kcal_out"].mean() if len(daily) else np.nan,
+        "avg_balance": daily["balance"].mean() if len(daily) else np.nan,
+        "exercise_min": daily["exercise_min"].sum() if len(daily) else 0.0,
+        "weight_start": weights["weight_kg"].iloc[0] if len(weights) else np.nan,
+        "weight_end": weights["weight_kg"].iloc[-1] if len(weights) else np.nan,
+        "unmatched_foods": len(report.get("unmatched", [])),
+        "unknown_activities": len(report.get("unknown", [])),
+    }
+    row["weight_change"] = row["weight_end"] - row["weight_start"]
+    return row
+
+def user_report(user_dir, foods, catalog):
+    # 사용자 폴더 하나 → (요약 한 줄 dict, 날짜별 합계 DataFrame)
+    user = Path(user_dir).name
+    logs, rollup, weights, report = user_logs(user_dir, foods, catalog)
+    return summarize(user, logs, rollup, weights, report), rollup.frame()
@@ -0,0 +1,115 @@
+# 로그 변경분으로 유지하는 집계: 날짜별 합계, 체중 타임라인
+import hashlib
+
+import numpy as np
+import pandas as pd
+
+from .activities import DEFAULT_WEIGHT_KG
+
+class DailyRollup:
+    # 날짜별 합계표: 섭취/소모 열량, 탄단지, 기록 건수.
+    # 로그에 행이 추가·삭제·수정될 때 바뀐 행만큼만 더하고 빼서 유지한다.
+    FIELDS = ["kcal_in","carbs_g","protein_g","fat_g","n_meals","kcal_out","exercise_min","n_exercises"]
+    SOURCES = {
+        "meal": ({"kcal": "kcal_in", "carbs_g": "carbs_g", "protein_g": "protein_g", "fat_g": "fat_g"}, "n_meals"),
+        "exercise": ({"kcal_burned": "kcal_out", "minutes": "exercise_min"}, "n_exercises"),
+    }
+
+    def __init__(self):
+        self._days = {}
+        self._frame = None
+        self.version = 0
+
+    def listener(self, kind):
+        return lambda removed, added: self.update(kind, removed, added)
+
+    def update(self, kind, removed=None, added=None):
+        sums, count_field = self.SOURCES[kind]
+        idx = [self.FIELDS.index(f) for f in sums.values()] + [self.FIELDS.index(count_field)]
+        for rows, sign in ((removed, -1.0), (added, 1.0)):
+            if rows is None or len(rows) == 0:
+                continue
+            values = rows.reindex(columns=list(sums)).apply(pd.to_numeric, errors="coerce").fillna(0.0)
+            values["_n"] = 1.0
+            grouped = values.groupby(rows["date"].to_numpy()).sum()
+            for day, vals in zip(grouped.index, grouped.to_numpy()):
+                acc = self._days.get(day)
+                if acc is None:
+                    acc = self._days[day] = np.zeros(len(self.FIELDS))
+                acc[idx] += sign * vals
+                if acc[self.FIELDS.index("n_meals")] <= 0 and acc[self.FIELDS.index("n_exercises")] <= 0:
+                    del self._days[day]
+        self._frame = None
+        self.version += 1
+
+    def day(self, day):
+        acc = self._days.get(pd.Timestamp(day))
+        return dict(zip(self.FIELDS, acc.tolist() if acc is not None else [0.0] * len(self.FIELDS)))
+
+    def frame(self):
+        # 날짜순 전체 합계표 (다일 차트용). 변경이 없으면 이전 결과를 재사용한다.
+        if self._frame is None:
+            days = sorted(self._days)
+            data = np.array([self._days[d] for d in days]).reshape(len(days), len(self.FIELDS))
+            self._frame = pd.DataFrame(data, index=pd.DatetimeIndex(days, name="date"), columns=self.FIELDS)
+            self._frame["balance"] = self._frame["kcal_in"] - self._frame["kcal_out"]
+        return self._frame
+
+class WeightTimeline:
+    # 체중 기록의 날짜순 보기. 최신 체중은 변경분으로 갱신하는 포인터로 유지하고,
+    # 운동 열량 계산에는 날짜별 as-of 체중(그 날짜 이전의 마지막 기록)을 쓴다.
+    DEFAULT_KG = DEFAULT_WEIGHT_KG
+
+    def __init__(self, log):
+        self.log = log
+        self.latest = None  # (날짜, 행 ID, 체중)
+        self._sorted = None
+        self.update(None, log.frame)
+        log.subscribe(self.update)
+
+    def update(self, removed=None, added=None):
+        self._sorted = None
+        if removed is not None and self.latest is not None and self.latest[1] in removed.index:
+            # 최신 기록이 빠진 경우에만 전체에서 다시 찾는다
+            self.latest = None
+            added = self.log.frame
+        if added is not None:
+            rows = added[added["weight_kg"].notna() & added["date"].notna()]
+            if len(rows):
+                keys = list(zip(rows["date"], rows.index))
+                i = max(range(len(keys)), key=keys.__getitem__)
+                if self.latest is None or keys[i] > self.latest[:2]:
+                    self.latest = (keys[i][0], keys[i][1], float(rows["weight_kg"].iloc[i]))
+
+    def copy(self):
+        # 지금 기록의 사본 (원본 로그와 연결되지 않음. 백그라운드 계산용)
+        log = self.log.blank()
+        log.extend(self.frame())
+        return WeightTimeline(log)
+
+    def digest(self):
+        # 기록 내용 해시: 같은 기록이면 세션이 달라도 같은 값 (백그라운드 작업 입력 키용)
+        f = self.frame()
+        data = f["date"].to_numpy(dtype="datetime64[ns]").tobytes() + f["weight_kg"].to_numpy(dtype=np.float32).tobytes()
+        return hashlib.sha256(data).hexdigest()
+
+    def latest_kg(self, default=DEFAULT_KG):
+        return default if self.latest is None else self.latest[2]
+
+    def frame(self):
+        # 날짜(같은 날은 입력 순) 정렬 프레임. 기록이 바뀔 때만 다시 정렬한다.
+        if self._sorted is None:
+            f = self.log.frame
+            f = f[f["weight_kg"].notna() & f["date"].notna()]
+            self._sorted = f.iloc[np.lexsort((f.index.to_numpy(), f["date"].to_numpy()))]
+        return self._sorted
+
+    def asof(self, dates, default=DEFAULT_KG):
+        # 날짜 배열 → 그 날짜의 as-of 체중. 첫 기록보다 이른 날짜는 첫 기록, 기록이 없으면 default
+        dates = pd.to_datetime(pd.Series(np.atleast_1d(dates)), errors="coerce").dt.normalize().to_numpy(dtype="datetime64[ns]")
+        f = self.frame()
+        if f.empty:
+            return np.full(len(dates), default)
+        pos = np.searchsorted(f["date"].to_numpy(dtype="datetime64[ns]"), dates, side="right") - 1
+        out = f["weight_kg"].to_numpy(dtype=float)[np.clip(pos, 0, None)]
+        return np.where(np.isnat(dates), self.latest_kg(default), out)
@@ -0,0 +1,113 @@
+# 음식명 검색: 초성·부분 문자열·오타 허용 검색
+import bisect
+import re
+
+import numpy as np
+
+CHOSEONG = "ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ"
+
+def to_choseong(text):
+    # 한글 음절을 초성으로 (현미밥 → ㅎㅁㅂ). 글자 수는 그대로 유지된다.
+    return "".join(CHOSEONG[(ord(ch) - 0xAC00) // 588] if "가" <= ch <= "힣" else ch for ch in text)
+
+def normalize_name(text, drop_paren=False):
+    # 검색·비교용 이름: 소문자, 공백 제거 (drop_paren이면 괄호 설명도 제거)
+    text = str(text).lower()
+    if drop_paren:
+        text = re.sub(r"\([^)]*\)", "", text)
+    return "".join(text.split())
+
+def edit_distance(a, b, limit):
+    # 레벤슈타인 거리. limit를 넘으면 limit + 1
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    prev = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        cur = [i]
+        for j, cb in enumerate(b, 1):
+            cur.append(min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + (ca != cb)))
+        if min(cur) > limit:
+            return limit + 1
+        prev = cur
+    return prev[-1]
+
+class FoodSearch:
+    # 음식명 검색 인덱스: 접두어 → 부분 문자열 → 초성(ㅎㅁㅂ → 현미밥) → 오타(편집 거리) 순으로 찾는다.
+    def __init__(self, names):
+        self.names = list(names)
+        norm = [normalize_name(n) for n in self.names]
+        cho = [to_choseong(n) for n in norm]
+        # 접두어: 정렬된 이름 + 이진 탐색
+        self._sorted = sorted((n, i) for i, n in enumerate(norm))
+        self._sorted_cho = sorted((n, i) for i, n in enumerate(cho))
+        # 부분 문자열: 이름을 한 줄씩 이어 붙인 문자열에서 str.find (초성 문자열도 글자 위치가 같다)
+        self._text = "\n".join(norm)
+        self._cho_text = "\n".join(cho)
+        self._starts = np.cumsum([0] + [len(n) + 1 for n in norm[:-1]]) if norm else np.array([0])
+        # 오타/이름 보정: 괄호 설명을 뺀 이름과 그 2글자 조각(bigram) 색인
+        self._plain = [normalize_name(n, drop_paren=True) for n in self.names]
+        self._exact = {}
+        for i, key in list(enumerate(norm)) + list(enumerate(self._plain)):
+            self._exact.setdefault(key, i)
+        self._grams = {}
+        for i, n in enumerate(self._plain):
+            for g in {n[k:k + 2] for k in range(len(n) - 1)}:
+                self._grams.setdefault(g, []).append(i)
+
+    def _prefix(self, table, q, limit):
+        lo = bisect.bisect_left(table, (q,))
+        out = []
+        for n, i in table[lo:]:
+            if not n.startswith(q) or len(out) >= limit:
+                break
+            out.append(i)
+        return out
+
+    def _substring(self, text, q, seen, limit):
+        out = []
+        pos = text.find(q)
+        while pos != -1 and len(out) < limit:
+            i = int(np.searchsorted(self._starts, pos, side="right")) - 1
+            if i not in seen:
+                seen.add(i)
+                out.append(i)
+            nxt = self._starts[i + 1] if i + 1 < len(self._starts) else len(text)
+            pos = text.find(q, nxt)
+        return out
+
+    def _fuzzy(self, q, limit_dist):
+        cands = {i for k in range(len(q) - 1) for i in self._grams.get(q[k:k + 2], ())}
+        scored = []
+        for i in cands:
+            d = edit_distance(q, self._plain[i], limit_dist)
+            if d <= limit_dist:
+                scored.append((d, len(self._plain[i]), i))
+        return [i for _, _, i in sorted(scored)]
+
+    def search(self, query, limit=20):
+        # 순위: 접두어 일치(짧은 이름 우선) → 부분 문자열 → 편집 거리 2 이하
+        q = normalize_name(query)
+        if not q:
+            return self.names[:limit]
+        if any(ch in CHOSEONG for ch in q):
+            q, table, text = to_choseong(q), self._sorted_cho, self._cho_text
+        else:
+            table, text = self._sorted, self._text
+        hits = sorted(self._prefix(table, q, limit * 4), key=lambda i: (len(self.names[i]), i))[:limit]
+        seen = set(hits)
+        if len(hits) < limit:
+            hits += self._substring(text, q, seen, limit - len(hits))
+        if len(hits) < limit and text is self._text:
+            hits += [i for i in self._fuzzy(q, 2) if i not in seen][:limit - len(hits)]
+        return [self.names[i] for i in hits]
+
+    def resolve(self, name):
+        # DB에 없는 이름을 가장 가까운 DB 음식명으로 보정 (공백·괄호 차이, 짧은 오타). 못 찾으면 None
+        for key in (normalize_name(name), normalize_name(name, drop_paren=True)):
+            if key in self._exact:
+                return self.names[self._exact[key]]
+        q = normalize_name(name, drop_paren=True)
+        if len(q) < 2:
+            return None
+        close = self._fuzzy(q, max(1, len(q) // 4))
+        return self.names[close[0]] if close else None
@@ -0,0 +1,97 @@
+# 음식 DB 스냅샷: 여러 음식 DB CSV를 합쳐 검증한 결과를 Arrow IPC 파일 하나로 미리 만들어 둔다.
+# 앱은 시작할 때 CSV를 다시 파싱하지 않고 스냅샷을 메모리 맵으로 읽는다.
+# 스냅샷에는 원본 CSV들의 SHA-256이 기록되어, 원본이 바뀌었으면(오래된 스냅샷) CSV로 되돌아간다.
+#   python -m carelog.snapshot                      # 기본 원본 → foods_snapshot.arrow
+#   python -m carelog.snapshot a.csv b.csv -o out.arrow
+import argparse
+import datetime
+import hashlib
+import json
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+
+from .columnar import foods_to_arrow
+from .foods import load_foods
+from .search import normalize_name
+
+# 스냅샷 형식 버전 (컬럼 구성이 바뀌면 올린다. 다른 버전의 스냅샷은 오래된 것으로 본다)
+SNAPSHOT_VERSION = 2
+# 기본 원본: 앞의 파일이 우선 (같은 음식이 여러 파일에 있으면 앞의 값 사용)
+FOOD_SOURCES = ["foods_korean.csv", "foods_korean (1).csv"]
+SNAPSHOT_FILE = "foods_snapshot.arrow"
+
+def source_hashes(paths):
+    # 원본 파일명 → 내용 SHA-256
+    return {Path(p).name: hashlib.sha256(Path(p).read_bytes()).hexdigest() for p in paths}
+
+def combined_digest(hashes):
+    # 원본 해시 목록 → 음식 DB 버전 (스냅샷이든 CSV든 같은 원본이면 같은 값)
+    return hashlib.sha256(json.dumps(hashes, sort_keys=True).encode()).hexdigest()
+
+def merge_foods(frames):
+    # 검증된 음식 DB들을 하나로: 공백을 무시한 이름이 같으면 앞의 DB 값을 쓴다.
+    # 반환: (합친 DB, 값이 서로 다른 중복 음식 목록)
+    merged = pd.concat(frames, ignore_index=True)
+    key = merged["food"].map(normalize_name)
+    dup = key.duplicated(keep="first")
+    nutrients = ["serving", "kcal", "carbs_g", "protein_g", "fat_g"]
+    first = merged[~dup].assign(_key=key[~dup]).set_index("_key")
+    later = merged[dup].assign(_key=key[dup])
+    differs = (later[nutrients].to_numpy() != first.loc[later["_key"], nutrients].to_numpy()).any(axis=1)
+    conflicts = sorted(later.loc[differs, "food"].unique())
+    return merged[~dup].reset_index(drop=True), conflicts
+
+def build_snapshot(paths, dest):
+    # 원본 CSV들 → 검증·병합 → Arrow IPC 스냅샷(메타데이터: 형식 버전, 원본 해시, 만든 시각). 반환: (DB, 메타데이터)
+    frame, conflicts = merge_foods([load_foods(p) for p in paths])
+    hashes = source_hashes(paths)
+    meta = {
+        "version": SNAPSHOT_VERSION,
+        "sources": hashes,
+        "digest": combined_digest(hashes),
+        "built": datetime.datetime.now().isoformat(timespec="seconds"),
+        "rows": len(frame),
+        "conflicts": conflicts,
+    }
+    tbl = foods_to_arrow(frame)
+    tbl = tbl.replace_schema_metadata({**(tbl.schema.metadata or {}), b"carelog.snapshot": json.dumps(meta, ensure_ascii=False).encode()})
+    with pa.OSFile(str(dest), "wb") as sink, pa.ipc.new_file(sink, tbl.schema) as writer:
+        writer.write_table(tbl)
+    return frame, meta
+
+def read_snapshot(path):
+    # 스냅샷 읽기 (메모리 맵). 반환: (DB, 메타데이터). 검증은 만들 때 끝났으므로 다시 하지 않는다.
+    tbl = pa.ipc.open_file(pa.memory_map(str(path), "r")).read_all()
+    meta = json.loads(tbl.schema.metadata[b"carelog.snapshot"])
+    return tbl.to_pandas(), meta
+
+def load_bundled_foods(paths, snapshot_path):
+    # 앱 시작용: 원본 해시가 스냅샷과 같으면 스냅샷을, 아니면(없음·오래됨) CSV를 직접 합친다.
+    # 반환: (DB, 버전 digest, 스냅샷 사용 여부)
+    hashes = source_hashes(paths)
+    snapshot_path = Path(snapshot_path)
+    if snapshot_path.exists():
+        try:
+            frame, meta = read_snapshot(snapshot_path)
+        except (OSError, KeyError, ValueError, pa.ArrowInvalid):
+            meta = None
+        if meta is not None and meta.get("version") == SNAPSHOT_VERSION and meta.get("sources") == hashes:
+            return frame, meta["digest"], True
+    frame, _ = merge_foods([load_foods(p) for p in paths])
+    return frame, combined_digest(hashes), False
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="carelog.snapshot", description="음식 DB CSV들을 합쳐 앱 시작용 스냅샷을 만듭니다.")
+    parser.add_argument("sources", nargs="*", type=Path, default=[Path(p) for p in FOOD_SOURCES], help="원본 CSV (앞의 파일 우선)")
+    parser.add_argument("-o", "--out", type=Path, default=Path(SNAPSHOT_FILE), help=f"스냅샷 파일 (기본: {SNAPSHOT_FILE})")
+    args = parser.parse_args(argv)
+    frame, meta = build_snapshot(args.sources, args.out)
+    print(f"{args.out}: 음식 {meta['rows']}개 (원본 {len(args.sources)}개, 버전 {meta['digest'][:12]})")
+    if meta["conflicts"]:
+        print(f"값이 서로 다른 중복 음식 {len(meta['conflicts'])}개는 앞의 파일 값을 사용: " + ", ".join(meta["conflicts"][:20]))
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,66 @@
+# 벤치마크·부하 테스트용 합성 데이터: 음식 DB, 식단·운동·체중 로그 (앱 CSV와 같은 컬럼)
+# 같은 seed면 같은 데이터가 나온다.
+import numpy as np
+import pandas as pd
+
+from .logs import MEAL_TYPES
+
+SYLLABLES = list("가나다라마바사아자차카타파하고노도로모보소오조초코토포호구누두루무부수우주추쿠투푸후")
+UNITS = [("공기", 200), ("개", 100), ("컵", 200), ("인분", 300), ("조각", 50), ("봉", 30)]
+
+def synthetic_foods(n, seed=0):
+    # 음식 DB n개 (food, serving, kcal, carbs_g, protein_g, fat_g). 이름은 서로 다른 세 글자 이상 한글
+    rng = np.random.default_rng(seed)
+    base = len(SYLLABLES)
+    width = max(3, int(np.ceil(np.log(max(n, 2)) / np.log(base))))
+    codes = rng.choice(base ** width, n, replace=False)
+    names = ["".join(SYLLABLES[(c // base ** k) % base] for k in range(width)) for c in codes]
+    unit = rng.integers(0, len(UNITS), n)
+    grams = np.array([UNITS[u][1] for u in unit]) * rng.choice([0.5, 1.0, 1.5], n)
+    carbs = rng.uniform(0, 60, n).round(1)
+    protein = rng.uniform(0, 30, n).round(1)
+    fat = rng.uniform(0, 20, n).round(1)
+    return pd.DataFrame({
+        "food": names,
+        "serving": [f"1{UNITS[u][0]}({g:g}g)" for u, g in zip(unit, grams)],
+        "kcal": (carbs * 4 + protein * 4 + fat * 9).round(),
+        "carbs_g": carbs,
+        "protein_g": protein,
+        "fat_g": fat,
+    })
+
+def _dates(n, rng, start, per_day):
+    days = pd.date_range(start, periods=max(1, -(-n // per_day)), freq="D")
+    return np.sort(rng.choice(days.strftime("%Y-%m-%d").to_numpy(), n))
+
+def synthetic_meals(n, foods, seed=0, start="2020-01-01", per_day=4):
+    # 식단 로그 n행 (date, meal, food, servings) — sample_meal_log.csv 형식
+    rng = np.random.default_rng(seed)
+    names = pd.Index(foods["food"] if isinstance(foods, pd.DataFrame) else foods)
+    return pd.DataFrame({
+        "date": _dates(n, rng, start, per_day),
+        "meal": rng.choice(MEAL_TYPES, n),
+        "food": names.to_numpy()[rng.integers(0, len(names), n)],
+        "servings": rng.choice([0.5, 1.0, 1.0, 1.0, 1.5, 2.0], n),
+    })
+
+def synthetic_exercise(n, activities, seed=0, start="2020-01-01", per_day=1):
+    # 운동 로그 n행 (date, activity, minutes, weight_kg, kcal_burned=0) — sample_exercise_log.csv 형식
+    rng = np.random.default_rng(seed)
+    activities = np.asarray(list(activities), dtype=object)
+    return pd.DataFrame({
+        "date": _dates(n, rng, start, per_day),
+        "activity": rng.choice(activities, n),
+        "minutes": rng.choice([15, 20, 30, 40, 60], n).astype(float),
+        "weight_kg": np.where(rng.random(n) < 0.3, np.nan, rng.normal(62, 3, n).round(1)),
+        "kcal_burned": 0.0,
+    })
+
+def synthetic_weights(n, seed=0, start="2020-01-01"):
+    # 체중 로그 n행 (하루 한 번, 천천히 변하는 값) — date, weight_kg, note
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "date": pd.date_range(start, periods=n, freq="D").strftime("%Y-%m-%d"),
+        "weight_kg": (65 + np.cumsum(rng.normal(-0.01, 0.15, n))).round(1),
+        "note": "",
+    })
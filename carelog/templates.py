@@ -0,0 +1,56 @@
+# 식단 템플릿과 기간 복사
+# 템플릿 = kcal·탄단지까지 계산해 둔 식단 행 묶음 (날짜 대신 시작일로부터 며칠째인지 day 컬럼).
+# 하루짜리(아침 프리셋 등)든 일주일짜리든, 적용할 시작일 목록에 한 번에 펼쳐 로그에 한 번에 추가한다.
+import numpy as np
+import pandas as pd
+
+from .foods import FoodIndex
+from .meals import enrich_meals
+
+TEMPLATE_COLUMNS = ["day", "meal", "food", "servings"] + FoodIndex.NUTRIENTS
+
+def template_from_items(food_index, items):
+    # (끼니, 음식, 서빙) 목록 → 하루짜리 템플릿 (영양성분은 지금 음식 DB로 계산)
+    rows = pd.DataFrame(list(items), columns=["meal", "food", "servings"])
+    enriched, _ = enrich_meals(rows, food_index)
+    enriched.insert(0, "day", 0)
+    return enriched[TEMPLATE_COLUMNS]
+
+def template_from_rows(rows, start=None):
+    # 식단 로그 행 → 템플릿. day = start(없으면 가장 이른 날짜)로부터 며칠째. 기록된 영양성분을 그대로 쓴다
+    rows = rows[rows["date"].notna()]
+    dates = rows["date"].to_numpy(dtype="datetime64[D]")
+    origin = np.datetime64(pd.Timestamp(start), "D") if start is not None else (dates.min() if len(dates) else None)
+    out = pd.DataFrame({c: rows[c].astype(object).to_numpy() if c in ("meal", "food") else rows[c].to_numpy() for c in TEMPLATE_COLUMNS[1:]})
+    out.insert(0, "day", (dates - origin).astype(np.int64) if len(dates) else np.zeros(0, dtype=np.int64))
+    return out.sort_values(["day"], kind="stable").reset_index(drop=True)
+
+def expand_template(template, starts):
+    # 템플릿을 시작일마다 펼친 식단 행 (날짜 = 시작일 + day). 시작일 순서대로, 같은 시작일 안에서는 템플릿 순서대로
+    starts = pd.to_datetime(pd.Series(np.atleast_1d(starts))).dt.normalize().to_numpy(dtype="datetime64[D]")
+    n = len(template)
+    block = template.drop(columns=["day"])
+    out = pd.DataFrame({c: np.tile(block[c].to_numpy(), len(starts)) for c in block.columns})
+    days = np.repeat(starts, n) + np.tile(template["day"].to_numpy(dtype=np.int64), len(starts)).astype("timedelta64[D]")
+    out.insert(0, "date", days.astype("datetime64[ns]"))
+    return out
+
+def daily_starts(start, end, weekdays=None):
+    # [start, end] 날짜 목록. weekdays(0=월 … 6=일)를 주면 그 요일만
+    days = pd.date_range(pd.Timestamp(start).normalize(), pd.Timestamp(end).normalize(), freq="D")
+    if weekdays is not None:
+        days = days[np.isin(days.weekday, list(weekdays))]
+    return days
+
+def copy_range(log, start, end, to, repeat=1):
+    # 기간 [start, end]의 식단을 to부터 붙여 넣는다. repeat > 1이면 기간 길이 간격으로 이어서 반복 (이번 주 → 다음 n주)
+    # 날짜 색인으로 원본 행만 읽고, 한 번의 extend로 추가한다. 반환: 추가한 행 수
+    start, end = pd.Timestamp(start).normalize(), pd.Timestamp(end).normalize()
+    rows = log.take(log.ids_between(start, end))
+    if rows.empty or repeat < 1:
+        return 0
+    span = (end - start).days + 1
+    starts = [pd.Timestamp(to).normalize() + pd.Timedelta(days=span * k) for k in range(repeat)]
+    added = expand_template(template_from_rows(rows, start), starts)
+    log.extend(added)
+    return len(added)
@@ -0,0 +1,56 @@
+# 주간·월간 추세와 차트용 다운샘플링
+import numpy as np
+import pandas as pd
+
+def compute_trends(daily, weights, freq):
+    # 주간("W")/월간("MS") 추세: 일평균 섭취·소모 열량, 탄단지 열량 비율(%), 체중 평균
+    # daily: DailyRollup.frame(), weights: weight_log 프레임
+    out = {}
+    d = daily
+    energy = d[["kcal_in", "kcal_out", "balance"]].resample(freq).mean().dropna(how="all")
+    out["energy"] = energy.rename(columns={"kcal_in": "섭취", "kcal_out": "소모", "balance": "밸런스"})
+    macro_kcal = d[["carbs_g", "protein_g", "fat_g"]].resample(freq).sum() * np.array([4.0, 4.0, 9.0])
+    total = macro_kcal.sum(axis=1).replace(0.0, np.nan)
+    out["macros"] = (macro_kcal.div(total, axis=0) * 100).dropna(how="all").rename(columns={"carbs_g": "탄수화물", "protein_g": "단백질", "fat_g": "지방"})
+    w = pd.Series(pd.to_numeric(weights["weight_kg"], errors="coerce").to_numpy(), index=pd.DatetimeIndex(weights["date"])).dropna().sort_index()
+    daily_w = w.resample("D").mean().dropna()
+    out["weight"] = pd.DataFrame({
+        "체중": daily_w,
+        "7일 이동평균": daily_w.rolling("7D").mean(),
+        "지수평활(EWMA)": daily_w.ewm(halflife="7D", times=daily_w.index).mean(),
+    })
+    out["weight_period"] = daily_w.resample(freq).mean().dropna().rename("평균 체중")
+    return out
+
+def lttb_indices(x, y, n_out):
+    # Largest-Triangle-Three-Buckets: 추세 모양을 유지하면서 n_out개 점의 위치를 고른다.
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    idx = np.empty(n_out, dtype=np.int64)
+    idx[0], idx[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        nhi = edges[i + 2] if i + 2 < len(edges) else n
+        avg_x, avg_y = x[hi:nhi].mean(), y[hi:nhi].mean()
+        area = np.abs((x[a] - avg_x) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (avg_y - y[a]))
+        a = lo + int(np.argmax(area))
+        idx[i + 1] = a
+    return idx
+
+def downsample(data, budget):
+    # 시계열(Series/DataFrame, 인덱스=날짜)을 차트당 budget개 점 안팎으로 줄인다.
+    # 여러 컬럼이면 컬럼별로 고른 점을 합친다.
+    if len(data) <= budget:
+        return data
+    frame = data.to_frame() if isinstance(data, pd.Series) else data
+    x = np.asarray(frame.index.asi8 if isinstance(frame.index, pd.DatetimeIndex) else np.arange(len(frame)), dtype=float)
+    per_col = max(3, budget // max(1, frame.shape[1]))
+    keep = set()
+    for col in frame.columns:
+        y = pd.to_numeric(frame[col], errors="coerce").to_numpy(dtype=float)
+        valid = np.flatnonzero(~np.isnan(y))
+        keep.update(valid[lttb_indices(x[valid], y[valid], per_col)].tolist())
+    return data.iloc[sorted(keep)]
@@ -0,0 +1,64 @@
+# 앱 되돌리기: 파일 업로드를 되돌렸을 때 업로더에 남은 파일을 다시 가져오지 않는지 (AppTest)
+import time
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("streamlit")
+from streamlit.testing.v1 import AppTest
+
+ROOT = Path(__file__).resolve().parent.parent
+EXERCISE_CSV = "date,activity,minutes,weight_kg\n2024-03-01,걷기(보통),30,60\n2024-03-02,걷기(보통),40,60\n".encode()
+
+@pytest.fixture
+def app(monkeypatch):
+    # 앱은 자기 폴더 기준 상대 경로로 파일을 읽는다
+    monkeypatch.chdir(ROOT)
+    at = AppTest.from_file(str(ROOT / "app (5).py"), default_timeout=60)
+    at.session_state["active_tab"] = "운동(걷기) 기록"
+    at.run()
+    return at
+
+def run(at):
+    at.run()
+    assert not at.exception, [e.message for e in at.exception]
+
+def upload_exercise(at, name, data):
+    uploader = next(u for u in at.file_uploader if u.label.startswith("sample_exercise_log"))
+    uploader.set_value((name, data, "text/csv"))
+    run(at)
+    deadline = time.time() + 30
+    while at.session_state["upload_jobs"]:
+        assert time.time() < deadline, "upload job did not finish"
+        time.sleep(0.05)
+        run(at)
+
+def click(at, label):
+    next(b for b in at.button if b.label == label).click()
+    run(at)
+
+def test_undo_upload_keeps_file_out_until_reimport(app):
+    upload_exercise(app, "e.csv", EXERCISE_CSV)
+    ids = list(app.session_state["exercise_log"].ids)
+    assert len(ids) == 2
+    cursor = app.session_state["journal"].cursor
+
+    click(app, "↩ 되돌리기")
+    assert len(app.session_state["exercise_log"]) == 0
+    assert app.session_state["journal"].cursor == cursor - 1
+    # 파일이 업로더에 그대로 있어도 다음 실행에서 다시 가져오지 않는다
+    run(app)
+    assert len(app.session_state["exercise_log"]) == 0
+    assert app.session_state["journal"].can_redo()
+
+    click(app, "↪ 다시 실행")
+    assert list(app.session_state["exercise_log"].ids) == ids
+    assert app.session_state["journal"].cursor == cursor
+
+    click(app, "↩ 되돌리기")
+    click(app, "다시 가져오기")
+    while app.session_state["upload_jobs"]:
+        time.sleep(0.05)
+        run(app)
+    assert len(app.session_state["exercise_log"]) == 2
+    assert not app.session_state["journal"].can_redo()
@@ -0,0 +1,47 @@
+# Parquet / Arrow IPC 로그 왕복: 컬럼 선택과 날짜 구간을 함께 쓸 때
+import io
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+pytest.importorskip("pyarrow")
+from carelog import LOG_SCHEMAS, FoodsDB, LogBuffer, columnar, enrich_meal_upload, load_foods
+
+ROOT = Path(__file__).resolve().parent.parent
+
+@pytest.fixture
+def meal_log():
+    log = LogBuffer(LOG_SCHEMAS["meal_log"])
+    log.extend([
+        {"date": "2024-01-31", "meal": "아침", "food": "현미밥", "servings": 1.0, "kcal": 300},
+        {"date": "2024-02-01", "meal": "점심", "food": "김치찌개", "servings": 1.5, "kcal": 250},
+        {"date": "2024-02-03", "meal": "저녁", "food": "두부조림", "servings": 1.0, "kcal": 150},
+    ])
+    return log
+
+@pytest.mark.parametrize("fmt", ["parquet", "arrow"])
+def test_round_trip(meal_log, fmt):
+    frame = columnar.read_log(io.BytesIO(columnar.log_to_bytes(meal_log.frame, "meal_log", fmt)), "meal_log", fmt)
+    pd.testing.assert_frame_equal(frame.astype({"meal": object, "food": object}),
+                                  meal_log.frame.astype({"meal": object, "food": object}), check_index_type=False)
+
+@pytest.mark.parametrize("fmt", ["parquet", "arrow"])
+@pytest.mark.parametrize("columns", [["food"], ["date", "food"]])
+def test_projection_with_date_filter(meal_log, fmt, columns):
+    data = columnar.log_to_bytes(meal_log.frame, "meal_log", fmt)
+    frame = columnar.read_log(io.BytesIO(data), "meal_log", fmt, columns=columns, start="2024-02-01", end="2024-02-02")
+    assert list(frame.columns) == columns
+    assert list(frame["food"].astype(str)) == ["김치찌개"]
+    assert list(frame.index) == [meal_log.ids[1]]
+
+def test_parquet_meal_upload_resolves_misspelled_food():
+    # 범주형 food 컬럼에서 오타 음식명을 DB 음식명으로 보정
+    db = FoodsDB("test", load_foods(ROOT / "foods_korean.csv"))
+    log = LogBuffer(LOG_SCHEMAS["meal_log"])
+    log.extend([{"date": "2024-02-01", "meal": "점심", "food": "김치찌게", "servings": 1.0}])
+    chunk = columnar.read_log(io.BytesIO(columnar.log_to_bytes(log.frame, "meal_log", "parquet")), "meal_log", "parquet")
+    chunk, report = enrich_meal_upload(chunk, db.index, db.search)
+    assert report == {"unmatched": [], "resolved": {"김치찌게": "김치찌개"}, "no_grams": []}
+    assert list(chunk["food"]) == ["김치찌개"]
+    assert chunk["kcal"].tolist() == [180.0]
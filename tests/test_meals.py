@@ -0,0 +1,24 @@
+# 식단 업로드 계산: 그램만 적은 행의 서빙 수 환산
+import numpy as np
+import pandas as pd
+
+from carelog import FoodsDB, clean_foods, enrich_meal_upload
+
+FOODS = pd.DataFrame({
+    "food": ["현미밥", "계란후라이"],
+    "serving": ["1공기(200g)", "1개"],
+    "kcal": [300, 90], "carbs_g": [65, 0.5], "protein_g": [6, 6], "fat_g": [2, 7],
+})
+
+def test_grams_only_row_without_serving_grams_is_reported():
+    db = FoodsDB("test", clean_foods(FOODS))
+    chunk = pd.DataFrame({
+        "date": ["2024-02-01", "2024-02-01"], "meal": ["아침", "아침"],
+        "food": ["현미밥", "계란후라이"], "servings": [np.nan, np.nan], "grams": [100.0, 50.0],
+    })
+    chunk, report = enrich_meal_upload(chunk, db.index, db.search)
+    assert report["no_grams"] == ["계란후라이"]
+    assert report["unmatched"] == []
+    assert chunk["servings"].tolist()[0] == 0.5
+    assert np.isnan(chunk["servings"].iloc[1])
+    assert chunk["kcal"].tolist() == [150.0, 0.0]